@@ -7,6 +7,9 @@ class AppConfig(AppConfig):
 
     def ready(self):
         """Set up LocalStack resources when the app is ready"""
+        # Register signal receivers (cache invalidation)
+        import app.signals  # noqa: F401
+
         try:
             # Import here to avoid circular imports
             from app.services.aws_mock import mock_aws_service
@@ -0,0 +1,44 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from app.services.token_revocation import is_token_revoked
+from app.services.user_cache import get_current_user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Reuses the token AnalyzeTokenMiddleware already verified instead of
+    decoding it again; request.user is the same SnapshotUser as
+    request.current_user.
+    """
+
+    def authenticate(self, request):
+        validated_token = getattr(request._request, "access_token", None)
+        if validated_token is None:
+            # No (valid) token seen by the middleware, keep stock behaviour
+            return super().authenticate(request)
+
+        # The middleware already turned revoked tokens away
+        return self.check_user(request._request.current_user), validated_token
+
+    def get_user(self, validated_token):
+        if is_token_revoked(validated_token):
+            raise InvalidToken("Token has been revoked")
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        return self.check_user(get_current_user(user_id))
+
+    def check_user(self, user):
+        # `not user` rather than `is None`: current_user is a lazy object
+        if not user:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        return user
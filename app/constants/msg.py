@@ -65,3 +65,4 @@ MSG_NOTIFICATION_FETCH_ERROR: Final = "Error Fetching Notifications!"
 
 
 MSG_UNAUTHORIZED_ACCESS: Final = "You are not authorized to access this resource."
+MSG_AUTHENTICATION_REQUIRED: Final = "Authentication credentials were not provided or are invalid."
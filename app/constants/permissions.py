@@ -0,0 +1,31 @@
+from typing import Final
+
+from app.enumeration.user_role import UserRole
+
+# Role -> {url name: methods the role may call}. Every (url name, method)
+# pair listed here is restricted to the roles that list it; anything not
+# listed is left to the view. Compiled once by RoleBasedAccessMiddleware.
+ROLE_PERMISSIONS: Final = {
+    UserRole.SUPER_ADMIN.value: {
+        "user-super-admin": ["GET"],
+    },
+    UserRole.AGENCY_ADMIN.value: {
+        "announcement-list-create": ["POST"],
+        "transparency-details": ["PUT"],
+        "transparency-folders": ["POST"],
+        "transparency-folder-detail": ["PUT", "DELETE"],
+        "transparency-subfolders": ["POST"],
+        "transparency-subfolder-detail": ["PUT", "DELETE"],
+        "transparency-reports": ["POST"],
+        "transparency-schools": ["PUT"],
+        "submission-assigned-user": ["POST"],
+        "submission-assign-evaluator": ["POST"],
+    },
+    UserRole.AGENCY_USER.value: {
+        "submission-assigned-user": ["POST"],
+        "submission-assign-evaluator": ["POST"],
+    },
+    UserRole.SCHOOL_ADMIN.value: {
+        "submission-assigned-user": ["POST"],
+    },
+}
@@ -1,11 +1,16 @@
+import asyncio
+
 import ujson
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
 
 from app.enumeration.room_type import RoomType
 from app.models.users import User
 from app.models.room import Room, RoomUser
 from app.models.room_messages import MessageReadBy, RoomMessage
+from app.services.presence import aheartbeat, amark_offline, amark_online
 from app.utils.background_task import send_email_to_room_users
 from app.utils.helper import generateUniqueID
 from django.utils import timezone
@@ -31,7 +36,22 @@ class MessageConsumer(AsyncWebsocketConsumer):
 
         await self.accept()
 
+        # Presence is cache + channel layer only, never the database
+        self.presence_buffer = {}
+        self.presence_flush = None
+        if await amark_online(self.scope["user"].id, self.channel_name):
+            await self._broadcast_presence(online=True)
+
     async def disconnect(self, *args, **kwargs):
+        if self.scope["user"].is_anonymous:
+            return
+
+        if getattr(self, "presence_flush", None):
+            self.presence_flush.cancel()
+
+        if await amark_offline(self.scope["user"].id, self.channel_name):
+            await self._broadcast_presence(online=False)
+
         # Leave room group
         await self.channel_layer.group_discard(
             f"user_{self.scope['user'].id}", self.channel_name
@@ -47,6 +67,16 @@ class MessageConsumer(AsyncWebsocketConsumer):
             if text_data[0] == "r":
                 await self._handle_read_receipt(text_data)
 
+            elif text_data[0] == "s":
+                await self._handle_resume(text_data)
+
+            elif text_data[0] == "h":
+                if await aheartbeat(self.scope["user"].id, self.channel_name):
+                    await self._broadcast_presence(online=True)
+
+            elif text_data[0] == "t":
+                await self._handle_typing(text_data)
+
             else:
                 await self._handle_chat_message(text_data)
 
@@ -80,6 +110,69 @@ class MessageConsumer(AsyncWebsocketConsumer):
             user_id=self.scope["user"].id,
         )
 
+    async def _handle_resume(self, text_data):
+        """
+        Replay what the client missed while disconnected.
+        Frame: s{"since": <iso>, "rooms": {<room_id>: <message id or iso>}}
+        Per-room cursors win over the global "since" cursor.
+        """
+        cursors = ujson.loads(text_data[1:] or "{}")
+        resumed_at = timezone.now().isoformat()
+
+        events = await self._db_get_missed_events(
+            since=cursors.get("since"), room_cursors=cursors.get("rooms") or {}
+        )
+
+        # Too much history to replay over the socket, let the client refetch
+        if len(events) > settings.WS_RESUME_MAX_EVENTS:
+            await self.send(
+                text_data=ujson.dumps(
+                    {"type": "resync_required", "cursor": resumed_at}
+                )
+            )
+            return
+
+        for event in events:
+            await self.send(text_data=ujson.dumps(event))
+
+        await self.send(
+            text_data=ujson.dumps(
+                {"type": "resume_complete", "replayed": len(events), "cursor": resumed_at}
+            )
+        )
+
+    async def _handle_typing(self, text_data):
+        # Frame: t<room_id> while typing, t<room_id>|0 when stopped
+        room_id, _, flag = text_data[1:].partition("|")
+        if room_id not in self.scope["state"]["rooms"]:
+            return
+
+        await self.channel_layer.group_send(
+            f"chat_{room_id}",
+            {
+                "type": "typing",
+                "room_id": room_id,
+                "typing": flag != "0",
+                "user": {
+                    "id": self.scope["user"].id,
+                    "first_name": self.scope["user"].first_name,
+                    "last_name": self.scope["user"].last_name,
+                },
+            },
+        )
+
+    async def _broadcast_presence(self, online):
+        for room_id in self.scope["state"]["rooms"]:
+            await self.channel_layer.group_send(
+                f"chat_{room_id}",
+                {
+                    "type": "presence",
+                    "room_id": room_id,
+                    "user_id": self.scope["user"].id,
+                    "online": online,
+                },
+            )
+
     async def _handle_chat_message(self, text_data):
         message_id = generateUniqueID()
         room_id = text_data.split("|")[0]
@@ -130,18 +223,153 @@ class MessageConsumer(AsyncWebsocketConsumer):
         # Send message to WebSocket
         await self.send(text_data=ujson.dumps(event))
 
+    async def typing(self, event):
+        if event["user"]["id"] != self.scope["user"].id:
+            await self.send(text_data=ujson.dumps(event))
+
+    async def presence(self, event):
+        # Buffer presence changes and flush them as one snapshot per interval
+        if event["user_id"] == self.scope["user"].id:
+            return
+
+        self.presence_buffer.setdefault(event["room_id"], {})[event["user_id"]] = (
+            event["online"]
+        )
+        if self.presence_flush is None:
+            self.presence_flush = asyncio.ensure_future(self._flush_presence())
+
+    async def _flush_presence(self):
+        await asyncio.sleep(settings.PRESENCE_BATCH_SECONDS)
+        rooms, self.presence_buffer = self.presence_buffer, {}
+        self.presence_flush = None
+        await self.send(
+            text_data=ujson.dumps({"type": "presence_snapshot", "rooms": rooms})
+        )
+
+    async def slow_consumer(self, event):
+        # The channel layer gave up on this socket's backlog, ask for a resume
+        await self.send(
+            text_data=ujson.dumps({"type": "resync_required", "reason": "slow_consumer"})
+        )
+        await self.close(code=4008)
+
+    async def room_joined(self, event):
+        # Membership added after connect (Room.add_user, RoomDetailAPI.put)
+        room_id = event["room_id"]
+        if room_id not in self.scope["state"]["rooms"]:
+            self.scope["state"]["rooms"].append(room_id)
+            await self.channel_layer.group_add(f"chat_{room_id}", self.channel_name)
+
+        await self.send(text_data=ujson.dumps(event))
+
+    async def room_left(self, event):
+        # Stop receiving traffic for rooms the user was removed from
+        room_id = event["room_id"]
+        if room_id in self.scope["state"]["rooms"]:
+            self.scope["state"]["rooms"].remove(room_id)
+            await self.channel_layer.group_discard(
+                f"chat_{room_id}", self.channel_name
+            )
+
+        await self.send(text_data=ujson.dumps(event))
+
     @database_sync_to_async
     def get_user_rooms(self):
         return list(
-            RoomUser.objects.filter(user=self.scope["user"]).values_list(
+            RoomUser.objects.filter(user_id=self.scope["user"].id).values_list(
                 "room_id", flat=True
             )
         )
 
     @database_sync_to_async
     def is_user_in_room(self, room_id):
-        user = self.scope["user"]
-        return RoomUser.objects.filter(room_id=room_id, user=user).exists()
+        user_id = self.scope["user"].id
+        return RoomUser.objects.filter(room_id=room_id, user_id=user_id).exists()
+
+    @database_sync_to_async
+    def _db_get_missed_events(self, since, room_cursors):
+        rooms = self.scope["state"]["rooms"]
+        cursors = {room_id: room_cursors.get(room_id, since) for room_id in rooms}
+
+        # Cursors may be message ids, resolve those to timestamps in one query
+        message_cursors = {
+            cursor
+            for cursor in cursors.values()
+            if cursor and parse_datetime(cursor) is None
+        }
+        message_timestamps = dict(
+            RoomMessage.objects.filter(id__in=message_cursors).values_list(
+                "id", "timestamp"
+            )
+        )
+
+        message_filter = Q(pk__in=[])
+        receipt_filter = Q(pk__in=[])
+        for room_id, cursor in cursors.items():
+            if not cursor:
+                continue
+            after = message_timestamps.get(cursor) or parse_datetime(cursor)
+            if after is None:
+                continue
+            message_filter |= Q(room_id=room_id, timestamp__gt=after)
+            receipt_filter |= Q(message__room_id=room_id, read_at__gt=after)
+
+        # Fetch one row past the limit so the caller can detect overflow
+        limit = settings.WS_RESUME_MAX_EVENTS + 1
+
+        messages = (
+            RoomMessage.objects.filter(message_filter)
+            .select_related("sender")
+            .order_by("timestamp")[:limit]
+        )
+        receipts = (
+            MessageReadBy.objects.filter(receipt_filter)
+            .select_related("user")
+            .annotate(room_id=F("message__room_id"))
+            .order_by("read_at")[:limit]
+        )
+
+        events = [
+            (
+                message.timestamp,
+                {
+                    "id": message.id,
+                    "type": "chat_message",
+                    "content": message.content,
+                    "room_id": message.room_id,
+                    "sender": {
+                        "id": message.sender.id,
+                        "first_name": message.sender.first_name,
+                        "last_name": message.sender.last_name,
+                        "email": message.sender.email,
+                    },
+                    "timestamp": message.timestamp.isoformat(),
+                    "file_urls": message.file_urls,
+                },
+            )
+            for message in messages
+        ] + [
+            (
+                receipt.read_at,
+                {
+                    "type": "read_receipt",
+                    "id": receipt.id,
+                    "room_id": receipt.room_id,
+                    "message_id": receipt.message_id,
+                    "user": {
+                        "id": receipt.user.id,
+                        "first_name": receipt.user.first_name,
+                        "last_name": receipt.user.last_name,
+                        "email": receipt.user.email,
+                    },
+                    "read_at": receipt.read_at.isoformat(),
+                },
+            )
+            for receipt in receipts
+        ]
+
+        events.sort(key=lambda event: event[0])
+        return [event for _, event in events]
 
     @database_sync_to_async
     def _db_save_read_receipt(self, message_id, read_receipt_id, user_id):
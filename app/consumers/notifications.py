@@ -37,6 +37,13 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
         await self.send(text_data=ujson.dumps(message))
 
+    async def slow_consumer(self, event):
+        # The channel layer gave up on this socket's backlog, ask for a refetch
+        await self.send(
+            text_data=ujson.dumps({"type": "resync_required", "reason": "slow_consumer"})
+        )
+        await self.close(code=4008)
+
     @database_sync_to_async
     def _handle_mark_as_read(self, notification_id):
         try:
@@ -0,0 +1,17 @@
+import ujson
+from django.core.management.base import BaseCommand
+
+from app.services.report_schedules import materialize_recurring_reports
+
+
+class Command(BaseCommand):
+    help = (
+        "Create ReportSchedule and Submission rows for recurring reports up to "
+        "REPORT_SCHEDULE_HORIZON_DAYS from now. Nothing runs this "
+        "automatically: schedule it from cron (e.g. every 6 hours), more often "
+        "than the horizon is long. Safe to re-run."
+    )
+
+    def handle(self, *args, **options):
+        totals = materialize_recurring_reports()
+        self.stdout.write(ujson.dumps(totals))
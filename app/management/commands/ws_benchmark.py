@@ -0,0 +1,320 @@
+import asyncio
+import time
+
+import ujson
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app.models.room import Room, RoomUser
+from app.models.users import User
+from app.utils.helper import generateUniqueID
+
+
+def percentiles(samples):
+    """p50/p95/p99/max of latency samples (seconds) in milliseconds"""
+    if not samples:
+        return {"count": 0, "p50": None, "p95": None, "p99": None, "max": None}
+
+    ordered = sorted(samples)
+
+    def pick(fraction):
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark MessageConsumer/NotificationConsumer fan-out in-process. "
+        "Creates temporary users and a room, drives chat, read-receipt and "
+        "notification traffic over N websocket clients and prints JSON results. "
+        "Chat messages enqueue the usual delayed email task; it is a no-op once "
+        "the benchmark data has been cleaned up."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=100)
+        parser.add_argument(
+            "--senders", type=int, default=5, help="Clients sending chat messages"
+        )
+        parser.add_argument(
+            "--messages", type=int, default=20, help="Chat messages per sender"
+        )
+        parser.add_argument(
+            "--receipts", type=int, default=5, help="Clients sending a read receipt"
+        )
+        parser.add_argument(
+            "--notifications", type=int, default=10, help="Notifications per client"
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=30, help="Seconds to wait per phase"
+        )
+        parser.add_argument("--output", help="Write JSON results to this file")
+
+    def handle(self, *args, **options):
+        users, room = self._setup(options["clients"])
+
+        try:
+            results = async_to_sync(self._run)(users, room, options)
+        finally:
+            self._teardown(users, room)
+
+        output = ujson.dumps(results, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output)
+
+        self.stdout.write(output)
+
+    def _setup(self, clients):
+        run_id = generateUniqueID()
+        users = User.objects.bulk_create(
+            [
+                User(
+                    id=generateUniqueID(),
+                    email=f"ws-bench-{index}-{run_id}@bench.local",
+                    username=f"ws-bench-{index}-{run_id}",
+                    first_name="Bench",
+                    last_name=str(index),
+                    is_active=True,
+                )
+                for index in range(clients)
+            ]
+        )
+        room = Room.objects.create(title=f"ws-bench-{run_id}")
+        RoomUser.objects.bulk_create(
+            [RoomUser(id=generateUniqueID(), room=room, user=user) for user in users]
+        )
+        return users, room
+
+    def _teardown(self, users, room):
+        room.delete()
+        User.objects.filter(id__in=[user.id for user in users]).delete()
+
+    def _communicator(self, application, path, user):
+        host = next(
+            (host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"),
+            "localhost",
+        )
+        communicator = WebsocketCommunicator(
+            application,
+            f"{path}?token={AccessToken.for_user(user)}",
+            headers=[(b"origin", f"http://{host}".encode())],
+        )
+        # uvicorn provides the lifespan "state" dict that the consumers rely on
+        communicator.scope["state"] = {}
+        return communicator
+
+    async def _connect_all(self, communicators):
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(communicator.connect() for communicator in communicators)
+        )
+        elapsed = time.perf_counter() - started
+        return sum(1 for connected, _ in results if connected), elapsed
+
+    async def _collect(self, communicator, expected, timeout, on_event):
+        """Receive until `expected` matching events arrived or the phase times out"""
+        received = 0
+        deadline = time.perf_counter() + timeout
+        while received < expected:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                event = ujson.loads(await communicator.receive_from(timeout=remaining))
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                break
+            if on_event(event):
+                received += 1
+        return received
+
+    async def _run(self, users, room, options):
+        from config.asgi import application
+
+        timeout = options["timeout"]
+        senders = min(options["senders"], len(users))
+        receipt_senders = min(options["receipts"], len(users))
+        chat_expected = senders * options["messages"]
+
+        chat_clients = [
+            self._communicator(application, "/ws/messaging/", user) for user in users
+        ]
+
+        with CaptureQueriesContext(connection) as handshake_queries:
+            chat_connected, chat_connect_time = await self._connect_all(chat_clients)
+
+        # Chat phase: every member receives every message of the room
+        chat_latencies = []
+        last_message_ids = {}
+
+        def on_chat(index):
+            def handler(event):
+                if event.get("type") != "chat_message":
+                    return False
+                _, _, sent_at = event["content"].split(" ")
+                chat_latencies.append(time.perf_counter() - float(sent_at))
+                last_message_ids[index] = event["id"]
+                return True
+
+            return handler
+
+        async def send_chat(communicator):
+            for seq in range(options["messages"]):
+                await communicator.send_to(
+                    text_data=f"{room.id}|bench {seq} {time.perf_counter()}"
+                )
+
+        with CaptureQueriesContext(connection) as chat_queries:
+            started = time.perf_counter()
+            collectors = [
+                asyncio.ensure_future(
+                    self._collect(communicator, chat_expected, timeout, on_chat(index))
+                )
+                for index, communicator in enumerate(chat_clients)
+            ]
+            await asyncio.gather(
+                *(send_chat(communicator) for communicator in chat_clients[:senders])
+            )
+            chat_delivered = sum(await asyncio.gather(*collectors))
+            chat_elapsed = time.perf_counter() - started
+
+        # Read receipt phase: a subset of members acknowledges the last message
+        receipt_latencies = []
+        receipt_sent_at = {}
+
+        def on_receipt(event):
+            if event.get("type") != "read_receipt":
+                return False
+            key = (event["message_id"], event["user"]["id"])
+            if key in receipt_sent_at:
+                receipt_latencies.append(time.perf_counter() - receipt_sent_at[key])
+            return True
+
+        async def send_receipt(index):
+            message_id = last_message_ids.get(index)
+            if not message_id:
+                return
+            receipt_sent_at[(message_id, users[index].id)] = time.perf_counter()
+            await chat_clients[index].send_to(text_data=f"r{message_id}|{room.id}")
+
+        with CaptureQueriesContext(connection) as receipt_queries:
+            started = time.perf_counter()
+            collectors = [
+                asyncio.ensure_future(
+                    self._collect(communicator, receipt_senders, timeout, on_receipt)
+                )
+                for communicator in chat_clients
+            ]
+            await asyncio.gather(*(send_receipt(i) for i in range(receipt_senders)))
+            receipt_delivered = sum(await asyncio.gather(*collectors))
+            receipt_elapsed = time.perf_counter() - started
+
+        for communicator in chat_clients:
+            await communicator.disconnect()
+
+        # Notification phase: group_send straight to each user's notification group
+        notification_clients = [
+            self._communicator(application, "/ws/notifications/", user)
+            for user in users
+        ]
+        notification_connected, notification_connect_time = await self._connect_all(
+            notification_clients
+        )
+
+        notification_latencies = []
+
+        def on_notification(event):
+            notification_latencies.append(time.perf_counter() - event["sent_at"])
+            return True
+
+        async def send_notifications(user):
+            for _ in range(options["notifications"]):
+                await channel_layer.group_send(
+                    f"notifications_{user.id}",
+                    {
+                        "type": "send_notification",
+                        "message": {
+                            "id": generateUniqueID(),
+                            "receiver_id": user.id,
+                            "sent_at": time.perf_counter(),
+                        },
+                    },
+                )
+
+        channel_layer = get_channel_layer()
+        started = time.perf_counter()
+        collectors = [
+            asyncio.ensure_future(
+                self._collect(
+                    communicator, options["notifications"], timeout, on_notification
+                )
+            )
+            for communicator in notification_clients
+        ]
+        await asyncio.gather(*(send_notifications(user) for user in users))
+        notification_delivered = sum(await asyncio.gather(*collectors))
+        notification_elapsed = time.perf_counter() - started
+
+        for communicator in notification_clients:
+            await communicator.disconnect()
+
+        return {
+            "config": {
+                "clients": len(users),
+                "senders": senders,
+                "messages_per_sender": options["messages"],
+                "receipt_senders": receipt_senders,
+                "notifications_per_client": options["notifications"],
+                "channel_layer": settings.CHANNEL_LAYERS["default"]["BACKEND"],
+            },
+            "handshake": {
+                "connected": chat_connected + notification_connected,
+                "messaging_seconds": round(chat_connect_time, 3),
+                "notifications_seconds": round(notification_connect_time, 3),
+                "db_queries_per_connect": round(
+                    len(handshake_queries) / max(len(chat_clients), 1), 3
+                ),
+            },
+            "chat": {
+                "sent": chat_expected,
+                "expected_deliveries": chat_expected * len(users),
+                "delivered": chat_delivered,
+                "latency_ms": percentiles(chat_latencies),
+                "deliveries_per_second": round(chat_delivered / chat_elapsed, 1),
+                "db_queries_per_message": round(
+                    len(chat_queries) / max(chat_expected, 1), 3
+                ),
+            },
+            "read_receipts": {
+                "sent": len(receipt_sent_at),
+                "expected_deliveries": len(receipt_sent_at) * len(users),
+                "delivered": receipt_delivered,
+                "latency_ms": percentiles(receipt_latencies),
+                "deliveries_per_second": round(receipt_delivered / receipt_elapsed, 1),
+                "db_queries_per_receipt": round(
+                    len(receipt_queries) / max(len(receipt_sent_at), 1), 3
+                ),
+            },
+            "notifications": {
+                "sent": options["notifications"] * len(users),
+                "delivered": notification_delivered,
+                "latency_ms": percentiles(notification_latencies),
+                "deliveries_per_second": round(
+                    notification_delivered / notification_elapsed, 1
+                ),
+            },
+        }
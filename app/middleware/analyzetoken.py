@@ -1,14 +1,27 @@
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import AccessToken
 
+from app.services.token_revocation import is_token_revoked
+from app.services.user_cache import get_current_user
+
 
 class AnalyzeTokenMiddleware(MiddlewareMixin):
     def process_request(self, request):
+        # The verified token is shared with ClaimsJWTAuthentication so the
+        # signature is only checked once per request
+        request.access_token = None
         auth_header = request.headers.get("Authorization", None)
         if auth_header and auth_header.startswith("Bearer "):
             token = auth_header.split(" ")[1]
             try:
                 access_token = AccessToken(token)
+                if is_token_revoked(access_token):
+                    # Revoked on password/role change: treated as no token,
+                    # so the role check in RoleBasedAccessMiddleware fails
+                    raise TokenError("Token has been revoked")
+                request.access_token = access_token
                 request.token_data = {
                     "email": access_token.get("email"),
                     "role": access_token.get("role"),
@@ -20,3 +33,8 @@ class AnalyzeTokenMiddleware(MiddlewareMixin):
                 request.token_data = {}
         else:
             request.token_data = {}
+
+        # The request's only principal (ClaimsJWTAuthentication hands the same
+        # object to DRF as request.user), resolved at most once per request
+        user_id = request.token_data.get("user_id")
+        request.current_user = SimpleLazyObject(lambda: get_current_user(user_id))
@@ -1,54 +1,58 @@
-import jwt
-from django.conf import settings
+from collections import defaultdict
+from types import MappingProxyType
+
+from django.core.exceptions import ImproperlyConfigured
 from django.http import JsonResponse
+from django.urls import get_resolver
 from django.utils.deprecation import MiddlewareMixin
-from rest_framework_simplejwt.tokens import AccessToken
 
 import app.constants.msg as MSG_CONST
+from app.constants.permissions import ROLE_PERMISSIONS
+
+
+def compile_permissions(role_permissions):
+    """Invert role -> view -> methods into a frozen (view, METHOD) -> roles map"""
+    known_views = get_resolver().reverse_dict
+    allowed = defaultdict(set)
+
+    for role, views in role_permissions.items():
+        for view_name, methods in views.items():
+            if view_name not in known_views:
+                raise ImproperlyConfigured(
+                    f"ROLE_PERMISSIONS references unknown view '{view_name}'"
+                )
+            for method in methods:
+                allowed[(view_name, method.upper())].add(role)
+
+    return MappingProxyType(
+        {key: frozenset(roles) for key, roles in allowed.items()}
+    )
 
 
 class RoleBasedAccessMiddleware(MiddlewareMixin):
-    RESTRICTED_ENDPOINTS = {
-        "Super_Admin": [],
-        "School_Admin": [],
-    }
-
-    def process_request(self, request):
-        auth_header = request.headers.get("Authorization", None)
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
-            try:
-                access_token = AccessToken(token)
-                request.token_data = {
-                    "email": access_token.get("email"),
-                    "role": access_token.get("role"),
-                    "school": access_token.get("school"),
-                    "agency": access_token.get("agency"),
-                    "user_id": access_token.get("user_id"),
-                }
-            except Exception as e:
-                request.token_data = {}
-        else:
-            request.token_data = {}
-        print(request.token_data)
-        if request.token_data:
-            role = request.token_data["role"]
-            print(request.resolver_match)
-            if request.resolver_match:
-                view = request.resolver_match.view_name
-                if (
-                    role in self.RESTRICTED_ENDPOINTS
-                    and view not in self.RESTRICTED_ENDPOINTS[role]
-                ):
-                    return JsonResponse(
-                        {"error": MSG_CONST.MSG_UNAUTHORIZED_ACCESS},
-                        status=403,
-                    )
-            else:
-                # Block access if resolver_match is None and role is in restricted endpoints
-                if role in self.RESTRICTED_ENDPOINTS:
-                    return JsonResponse(
-                        {"error": MSG_CONST.MSG_UNAUTHORIZED_ACCESS},
-                        status=403,
-                    )
-        return None
+    """
+    Enforces ROLE_PERMISSIONS with the claims AnalyzeTokenMiddleware already
+    decoded (must run after it). One dict lookup per request, no DB access.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.permissions = compile_permissions(ROLE_PERMISSIONS)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        allowed_roles = self.permissions.get(
+            (request.resolver_match.view_name, request.method)
+        )
+        if allowed_roles is None:
+            return None
+
+        token_data = getattr(request, "token_data", None)
+        if not token_data:
+            # No token, or one that is invalid, expired or revoked
+            return JsonResponse(
+                {"error": MSG_CONST.MSG_AUTHENTICATION_REQUIRED}, status=401
+            )
+        if token_data.get("role") in allowed_roles:
+            return None
+
+        return JsonResponse({"error": MSG_CONST.MSG_UNAUTHORIZED_ACCESS}, status=403)
@@ -1,40 +1,59 @@
-import jwt
+from urllib.parse import parse_qs
+
 from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import AccessToken
 
-from app.models.users import User
+from app.services.token_revocation import ais_token_revoked
+from app.services.user_cache import (
+    SnapshotUser,
+    load_user_snapshot,
+    user_snapshot_key,
+)
 
 
-@database_sync_to_async
-def get_user(token_key):
+async def get_user(token_key):
+    # Signature and expiry are verified in-process, no DB involved
     try:
-        # Decode the JWT token
-        decoded_data = jwt.decode(token_key, settings.SECRET_KEY, algorithms=["HS256"])
-        user_id = decoded_data.get("user_id")
+        access_token = AccessToken(token_key)
+    except TokenError:
+        return AnonymousUser()
+
+    if await ais_token_revoked(access_token):
+        return AnonymousUser()
 
-        # Get the user
-        return User.objects.get(id=user_id)
-    except (jwt.InvalidTokenError, User.DoesNotExist):
+    user_id = access_token.get("user_id")
+    if not user_id:
         return AnonymousUser()
 
+    # Serve the principal from the snapshot cache, only hit the DB on a miss
+    key = user_snapshot_key(user_id)
+    snapshot = await cache.aget(key)
+    if snapshot is None:
+        snapshot = await database_sync_to_async(load_user_snapshot)(user_id)
+        if snapshot is None:
+            return AnonymousUser()
+        await cache.aset(key, snapshot, settings.USER_SNAPSHOT_TTL)
+
+    return SnapshotUser(snapshot)
+
 
 class TokenAuthMiddleware(BaseMiddleware):
     async def __call__(self, scope, receive, send):
         try:
             # Get the token from query string
-            query_string = scope.get("query_string", b"").decode()
-            query_params = dict(x.split("=") for x in query_string.split("&") if x)
-
-            token_key = query_params.get("token", None)
+            query_params = parse_qs(scope.get("query_string", b"").decode())
+            token_key = query_params.get("token", [None])[0]
 
             if token_key:
                 scope["user"] = await get_user(token_key)
             else:
                 scope["user"] = AnonymousUser()
-        except:
+        except Exception:
             scope["user"] = AnonymousUser()
 
         return await super().__call__(scope, receive, send)
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-19 09:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0033_report_school_year"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="roommessage",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector(
+                    "content", config="english"
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="roommessage",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="roommessage_search_gin"
+            ),
+        ),
+    ]
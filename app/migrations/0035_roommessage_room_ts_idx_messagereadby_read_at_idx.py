@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0034_roommessage_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="roommessage",
+            index=models.Index(
+                fields=["room", "timestamp"], name="roommessage_room_ts_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="messagereadby",
+            index=models.Index(fields=["read_at"], name="messagereadby_read_at_idx"),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.4 on 2026-10-19 14:20
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_activity_count(apps, schema_editor):
+    Report = apps.get_model("app", "Report")
+    ReportActivity = apps.get_model("app", "ReportActivity")
+
+    counts = (
+        ReportActivity.objects.filter(report_id=OuterRef("pk"))
+        .order_by()
+        .values("report_id")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    Report.objects.update(activity_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0035_roommessage_room_ts_idx_messagereadby_read_at_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="report",
+            name="activity_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of activities, maintained on write"
+            ),
+        ),
+        migrations.RunPython(backfill_activity_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="reportactivity",
+            index=models.Index(
+                fields=["report", "-created_at", "-id"],
+                name="reportactivity_report_ts_idx",
+            ),
+        ),
+    ]
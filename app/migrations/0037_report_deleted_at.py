@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-19 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0036_report_activity_count_reportactivity_report_ts_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="report",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -18,6 +18,13 @@ class ReportActivity(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pages of a report's timeline, newest first
+            models.Index(
+                fields=["report", "-created_at", "-id"],
+                name="reportactivity_report_ts_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.first_name}'s activity on {self.report.name}"
@@ -26,6 +26,13 @@ class ReportCategory(models.Model):
         super().save(*args, **kwargs)
 
 
+class ActiveReportManager(models.Manager):
+    """Hides reports tombstoned for background deletion"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Report(models.Model):
     SCHEDULE_TYPE_CHOICES = [
         ("SPECIFIC_DATES", "Specific Dates"),
@@ -109,9 +116,18 @@ class Report(models.Model):
     approved = models.BooleanField(
         default=False, help_text="Whether this report has been approved"
     )
+    activity_count = models.PositiveIntegerField(
+        default=0, help_text="Number of activities, maintained on write"
+    )
+    # Tombstone: set when the report is queued for background deletion
+    deleted_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = models.Manager()
+    # Reports not queued for deletion; use it wherever reports are listed
+    active = ActiveReportManager()
+
     def __str__(self):
         return self.name
 
@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.utils import timezone
 
@@ -16,8 +18,20 @@ class RoomMessage(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     file_urls = models.JSONField(default=list, blank=True)
 
+    # Maintained by Postgres on every write, used by the message search endpoint
+    search_vector = models.GeneratedField(
+        expression=SearchVector("content", config="english"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
         ordering = ["timestamp"]  # Messages will be ordered by time
+        indexes = [
+            GinIndex(fields=["search_vector"], name="roommessage_search_gin"),
+            # Missed-message replay on websocket resume
+            models.Index(fields=["room", "timestamp"], name="roommessage_room_ts_idx"),
+        ]
 
     def __str__(self):
         return f"Message from {self.sender.first_name} in Room {self.room.id}"
@@ -40,6 +54,9 @@ class MessageReadBy(models.Model):
 
     class Meta:
         unique_together = ("message", "user")  # Prevent duplicate reads
+        indexes = [
+            models.Index(fields=["read_at"], name="messagereadby_read_at_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.id:
@@ -9,6 +9,12 @@ from app.models.users import User
 from app.utils.helper import generateUniqueID
 
 
+class SubmissionQuerySet(models.QuerySet):
+    def active(self):
+        """Hides submissions whose report is tombstoned for background deletion"""
+        return self.filter(report_schedule__report__deleted_at__isnull=True)
+
+
 class Submission(models.Model):
     id = models.CharField(max_length=50, primary_key=True)
     school = models.ForeignKey(School, on_delete=models.CASCADE)
@@ -57,6 +63,9 @@ class Submission(models.Model):
         related_name="submission_updated_by",
     )
 
+    # Use objects.active() wherever submissions are listed or looked up
+    objects = SubmissionQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.school.name} - {self.report.name}"
 
@@ -1,19 +1,31 @@
+import hmac
 import random
 import time
 import pyotp
 import math
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
 from django.contrib.contenttypes.fields import GenericRelation
+from django.core.cache import cache
 from django.utils import timezone
-from django.db.models import JSONField
+from django.db.models import Func, JSONField, TextField, Value
+from django.db.models.functions import Cast
 
 from app.models.agencies import Agency
 from app.models.documents import Document
 from app.models.schools import School
 
 
+class JSONArrayRemove(Func):
+    """Postgres `jsonb - text`: the array without the given string element"""
+
+    arg_joiner = " - "
+    template = "(%(expressions)s)"
+    output_field = JSONField()
+
+
 class User(AbstractUser):
 
     id = models.CharField(max_length=50, primary_key=True)
@@ -94,7 +106,7 @@ class User(AbstractUser):
     def generate_mfa_secret(self):
         """Generate a new MFA secret key"""
         self.mfa_secret = pyotp.random_base32()
-        self.save()
+        self.save(update_fields=["mfa_secret"])
         return self.mfa_secret
 
     def verify_totp_code(self, code):
@@ -120,36 +132,60 @@ class User(AbstractUser):
             code = f"{first_part}-{second_part}"
             codes.append(code)
         self.mfa_backup_codes = codes
-        self.save()
+        self.save(update_fields=["mfa_backup_codes"])
         return codes
 
     def verify_backup_code(self, code):
         """Verify and consume a backup code"""
+        # Remove the code in a single conditional UPDATE so it can only be
+        # used once, even by concurrent requests
+        consumed = User.objects.filter(
+            pk=self.pk, mfa_backup_codes__contains=[code]
+        ).update(
+            mfa_backup_codes=JSONArrayRemove(
+                "mfa_backup_codes", Cast(Value(code), output_field=TextField())
+            )
+        )
+        if not consumed:
+            return False
+
         if code in self.mfa_backup_codes:
             self.mfa_backup_codes.remove(code)
-            self.save()
-            return True
-        return False
+        return True
+
+    def _temp_code_keys(self):
+        return f"mfa_temp_code:{self.pk}", f"mfa_temp_code_attempts:{self.pk}"
 
     def generate_temp_code(self):
         """Generate a temporary code for SMS/Email verification"""
+        # Held in the cache (TTL = code lifetime) rather than on the User row
         code = ''.join(random.choices('0123456789', k=6))
-        self.mfa_temp_code = code
-        self.mfa_temp_code_expires_at = timezone.now() + timezone.timedelta(seconds=60)
-        self.save()
+        code_key, attempts_key = self._temp_code_keys()
+        cache.set(code_key, code, settings.MFA_TEMP_CODE_TTL)
+        cache.delete(attempts_key)
         return code
 
     def verify_temp_code(self, code):
         """Verify a temporary code for SMS/Email verification"""
-        if not self.mfa_temp_code or not self.mfa_temp_code_expires_at:
+        code_key, attempts_key = self._temp_code_keys()
+        expected = cache.get(code_key)
+        if not expected:
             return False
-        if timezone.now() > self.mfa_temp_code_expires_at:
+
+        cache.add(attempts_key, 0, settings.MFA_TEMP_CODE_TTL)
+        try:
+            attempts = cache.incr(attempts_key)
+        except ValueError:
+            attempts = 1
+        if attempts > settings.MFA_TEMP_CODE_MAX_ATTEMPTS:
+            # Too many guesses, the code is burned
+            cache.delete_many([code_key, attempts_key])
             return False
-        if code != self.mfa_temp_code:
+
+        if not hmac.compare_digest(str(code), expected):
             return False
-        self.mfa_temp_code = None
-        self.mfa_temp_code_expires_at = None
-        self.save()
+
+        cache.delete_many([code_key, attempts_key])
         return True
 
     def soft_delete(self):
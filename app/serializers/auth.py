@@ -1,10 +1,20 @@
-from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
 from rest_framework_simplejwt.serializers import TokenRefreshSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.settings import api_settings
 
 import app.constants.msg as MSG_CONST
 from app.models.users import User
+from app.services.login_guard import (
+    authenticate_bounded,
+    check_attempts,
+    clear_attempts,
+    get_client_ip,
+    record_failed_attempt,
+)
+from app.services.token_claims import apply_token_claims, get_token_claims
+from app.services.token_revocation import is_token_revoked, revoke_token
 from app.utils.helper import mask_phone, mask_email
 from app.enumeration.mfa import MFAMethod, PhoneVerificationMethod
 
@@ -17,36 +27,45 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
     def validate(self, data):
-        user = authenticate(username=data["email"], password=data["password"])
+        request = self.context.get("request")
+        ip = get_client_ip(request) if request else None
+
+        # Shed accounts/IPs over their attempt budget before hashing anything
+        check_attempts("login", data["email"], ip)
+
+        user = authenticate_bounded(data["email"], data["password"])
         if user and user.is_active:
+            clear_attempts("login", data["email"])
             return user
+
+        record_failed_attempt("login", data["email"], ip)
         raise serializers.ValidationError(MSG_CONST.MSG_USER_VALIDATION["credential"])
     
 # Custom Token Refresh Serializer
 class CustomTokenRefreshSerializer(TokenRefreshSerializer):
     def validate(self, attrs):
-        data = super().validate(attrs)
-        refresh = RefreshToken(attrs['refresh'])
-
-        user_id = refresh['user_id']
-        user = User.objects.get(id=user_id, deleted_at__isnull=True)
-        if not user:
+        # Decode the refresh token once and build the access token from the
+        # cached claims instead of re-reading the user, schools and agency
+        refresh = self.token_class(attrs['refresh'])
+        if is_token_revoked(refresh):
+            raise InvalidToken("Token has been revoked")
+
+        claims = get_token_claims(refresh[api_settings.USER_ID_CLAIM])
+        if claims is None:
             raise serializers.ValidationError(MSG_CONST.MSG_USER_DELETED)
 
-        access_token = refresh.access_token
+        access_token = apply_token_claims(refresh.access_token, claims)
+        data = {'access': str(access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                revoke_token(refresh)
 
-        access_token['user_id'] = user.id
-        access_token['email'] = user.email
-        access_token['role'] = user.role
-        access_token['schools'] = None
-        access_token['agency'] = None
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
 
-        if hasattr(user, 'schools') and user.schools.exists():
-            access_token['schools'] = list(user.schools.values_list('id', flat=True))
-        if hasattr(user, 'agency') and user.agency is not None:
-            access_token['agency'] = user.agency.id
-        data['access'] = str(access_token)
-        
         return data
 
 
@@ -56,7 +75,7 @@ class ChangePasswordSerializer(serializers.Serializer):
     newPassword = serializers.CharField(write_only=True, min_length=8)
 
     def validate_currentPassword(self, value):
-        user = self.context['request'].user
+        user = self.context['request'].user.get_user()
         if not user.check_password(value):
             raise serializers.ValidationError("Current password is incorrect.")
         return value
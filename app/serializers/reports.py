@@ -1,7 +1,6 @@
 from django.db import models
 from rest_framework import serializers
 
-from app.models.report_schedules import ReportSchedule
 from app.models.report_scoring import ReportScoring
 from app.models.reports import Report, ReportCategory
 from app.models.submissions import Submission
@@ -11,9 +10,47 @@ from app.serializers.report_scoring import ReportScoringSerializer
 from app.serializers.submission_instructions import SubmissionInstructionSerializer
 from app.serializers.users import UserFullNameSerializer
 from app.models.agencies import Agency
+from app.services.report_schedules import (
+    materialize_report_schedules,
+    sync_report_schedules,
+)
+
+
+def get_assigned_schools_map(report_ids):
+    """
+    {report_id: [{id, name, assigned_at}]} for many reports in one grouped
+    query, one entry per school (submissions repeat per schedule)
+    """
+    rows = (
+        Submission.objects.filter(report_schedule__report_id__in=report_ids)
+        .values("report_schedule__report_id", "school_id", "school__name")
+        .annotate(assigned_at=models.Min("created_at"))
+        .order_by("school__name")
+    )
+
+    assigned = {report_id: [] for report_id in report_ids}
+    for row in rows:
+        assigned[row["report_schedule__report_id"]].append(
+            {
+                "id": row["school_id"],
+                "name": row["school__name"],
+                "assigned_at": row["assigned_at"],
+            }
+        )
+    return assigned
+
+
+class AssignedSchoolsMixin:
+    def get_assigned_schools(self, obj):
+        """Get list of assigned schools with details"""
+        # List views precompute the map for the whole page (see list_reports)
+        assigned = self.context.get("assigned_schools")
+        if assigned is None:
+            assigned = get_assigned_schools_map([obj.id])
+        return assigned.get(obj.id, [])
 
 
-class ReportSerializer(serializers.ModelSerializer):
+class ReportSerializer(AssignedSchoolsMixin, serializers.ModelSerializer):
     # Explicitly define categories field to handle array of IDs
     name = serializers.CharField(required=True, allow_null=False)
     categories = serializers.PrimaryKeyRelatedField(
@@ -36,7 +73,7 @@ class ReportSerializer(serializers.ModelSerializer):
     class Meta:
         model = Report
         fields = "__all__"
-        read_only_fields = ["id", "edited_by"]
+        read_only_fields = ["id", "edited_by", "activity_count", "deleted_at"]
 
     def validate_schedule_type(self, value):
         """
@@ -55,10 +92,10 @@ class ReportSerializer(serializers.ModelSerializer):
 
         if schedule_type == "RECURRING_DATES":
             # Check if all required recurring fields are present
+            # (recurring_occurrences is optional: null repeats indefinitely)
             recurring_fields = [
                 "recurring_period",
                 "recurring_interval",
-                "recurring_occurrences",
                 "recurring_first_occurrence",
             ]
             missing_fields = [
@@ -76,7 +113,8 @@ class ReportSerializer(serializers.ModelSerializer):
                 )
 
             # Validate occurrences is positive
-            if data.get("recurring_occurrences", 0) <= 0:
+            occurrences = data.get("recurring_occurrences")
+            if occurrences is not None and occurrences <= 0:
                 raise serializers.ValidationError(
                     "Recurring occurrences must be a positive number"
                 )
@@ -96,10 +134,11 @@ class ReportSerializer(serializers.ModelSerializer):
         if categories_data:
             report.categories.set(categories_data)
 
-        # Create schedules
-        for schedule_data in schedules_data:
-            if schedule_data:  # Only create if schedule_data is not empty
-                ReportSchedule.objects.create(report=report, **schedule_data)
+        # Recurring schedules come from the rule, not from the client
+        if report.schedule_type == "RECURRING_DATES":
+            materialize_report_schedules(report)
+        else:
+            sync_report_schedules(report, schedules_data)
 
         # Create scoring if provided and not None
         if scoring_data is not None and scoring_data:
@@ -121,42 +160,15 @@ class ReportSerializer(serializers.ModelSerializer):
         if categories_data is not None:
             instance.categories.set(categories_data)
 
-        # Update schedules if provided
-        if schedules_data is not None:
-            if validated_data.get("schedule_type") != instance.schedule_type:
-                instance.schedules.all().delete()
-
-                for schedule_data in schedules_data:
-                    if schedule_data:  # Only create if schedule_data is not empty
-                        ReportSchedule.objects.create(report=instance, **schedule_data)
-
-            else:
-                all_schedules = instance.schedules.all()
-
-                current_schedules = instance.schedules.filter(
-                    schedule_time__in=[
-                        date.get("schedule_time")
-                        for date in schedules_data
-                        if date and date.get("schedule_time")
-                    ]
-                )
-
-                remove = all_schedules.exclude(
-                    id__in=[schedule.id for schedule in current_schedules]
-                )
-
-                remove.delete()
+        recurring = (
+            validated_data.get("schedule_type", instance.schedule_type)
+            == "RECURRING_DATES"
+        )
 
-                # For the new schedules data, we should overwrite the name
-                for schedule_data in schedules_data:
-                    if schedule_data and schedule_data.get(
-                        "schedule_time"
-                    ):  # Only process if schedule_data is not empty and has schedule_time
-                        ReportSchedule.objects.update_or_create(
-                            report=instance,
-                            schedule_time=schedule_data.get("schedule_time"),
-                            defaults={"report_name": schedule_data.get("report_name")},
-                        )
+        # Update schedules if provided (recurring ones are generated below,
+        # materialize prunes the old specific dates and keeps the schools)
+        if not recurring and schedules_data is not None:
+            sync_report_schedules(instance, schedules_data)
 
         # Update scoring if provided
         if scoring_data is not None and scoring_data:
@@ -183,29 +195,23 @@ class ReportSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
-        instance.save()
+        # Only the edited columns: activity_count is maintained with F()
+        # updates and deleted_at by the deletion job, a full-row save would
+        # write back stale values of both
+        instance.save(update_fields=[*validated_data, "updated_at"])
+
+        if recurring:
+            materialize_report_schedules(instance, prune=True)
+
         return instance
 
     def get_has_scoring(self, obj):
         """Check if report has scoring criteria set up"""
         return obj.use_scoring and hasattr(obj, "scoring")
 
-    def get_assigned_schools(self, obj):
-        """Get list of assigned schools with details"""
-        return list(
-            Submission.objects.filter(report_schedule__report=obj)
-            .select_related("school")  # Optimize by fetching school data in same query
-            .values("school_id", "school__name")
-            .annotate(
-                id=models.F("school_id"),
-                name=models.F("school__name"),
-                assigned_at=models.F("created_at"),
-            )
-            .values("id", "name", "assigned_at")
-        )
 
 
-class ReportListSerializer(serializers.ModelSerializer):
+class ReportListSerializer(AssignedSchoolsMixin, serializers.ModelSerializer):
     assigned_schools = serializers.SerializerMethodField()
 
     class Meta:
@@ -226,19 +232,6 @@ class ReportListSerializer(serializers.ModelSerializer):
             "assigned_schools",
         ]
 
-    def get_assigned_schools(self, obj):
-        """Get list of assigned schools with details"""
-        return list(
-            Submission.objects.filter(report=obj)
-            .select_related("school")
-            .values("school_id", "school__name")
-            .annotate(
-                id=models.F("school_id"),
-                name=models.F("school__name"),
-                assigned_at=models.F("created_at"),
-            )
-            .values("id", "name", "assigned_at")
-        )
 
 
 class ReportCategorySerializer(serializers.ModelSerializer):
@@ -252,7 +245,7 @@ class ReportCategorySerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class ReportDetailSerializer(serializers.ModelSerializer):
+class ReportDetailSerializer(AssignedSchoolsMixin, serializers.ModelSerializer):
     categories = ReportCategorySerializer(many=True, read_only=True)
     schedule_times = serializers.SerializerMethodField()
     edited_by = UserFullNameSerializer(read_only=True)
@@ -272,7 +265,8 @@ class ReportDetailSerializer(serializers.ModelSerializer):
 
     def get_schedule_times(self, obj):
         """Get all schedule times for this report"""
-        schedules = obj.schedules.all().order_by("schedule_time")
+        # ReportSchedule is ordered by schedule_time, this also uses prefetches
+        schedules = obj.schedules.all()
         return [
             {
                 "id": schedule.id,
@@ -282,19 +276,6 @@ class ReportDetailSerializer(serializers.ModelSerializer):
             for schedule in schedules
         ]
 
-    def get_assigned_schools(self, obj):
-        """Get list of assigned schools with details"""
-        return list(
-            Submission.objects.filter(report=obj)
-            .select_related("school")
-            .values("school_id", "school__name")
-            .annotate(
-                id=models.F("school_id"),
-                name=models.F("school__name"),
-                assigned_at=models.F("created_at"),
-            )
-            .values("id", "name", "assigned_at")
-        )
 
 
 class SubmissionReportSerializer(serializers.ModelSerializer):
@@ -119,7 +119,7 @@ class RoomSerializer(serializers.ModelSerializer):
             room = Room.objects.create(**validated_data)
 
             # Add the current user
-            RoomUser.objects.create(room=room, user=request.user)
+            RoomUser.objects.create(room=room, user_id=request.user.id)
 
             # Add other users
             for user_id in user_ids:
@@ -167,7 +167,7 @@ class RoomListSerializer(serializers.ModelSerializer):
         if request and request.user:
             return (
                 RoomMessage.objects.filter(room=obj)
-                .exclude(read_by__user=request.user)
+                .exclude(read_by__user_id=request.user.id)
                 .count()
             )
         return 0
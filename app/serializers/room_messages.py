@@ -51,19 +51,19 @@ class RoomMessageSerializer(serializers.ModelSerializer):
             return MessageReadBySerializer(read_by, many=True).data
 
         # Fallback to direct query if prefetch wasn't used
-        message_read_by = MessageReadBy.objects.filter(message=obj, user=request.user)
+        message_read_by = MessageReadBy.objects.filter(message=obj, user_id=request.user.id)
         return MessageReadBySerializer(message_read_by, many=True).data
 
     def create(self, validated_data):
         request = self.context.get("request")
         if request and request.user:
-            validated_data["sender"] = request.user
+            validated_data["sender_id"] = request.user.id
 
             # Create the message
             message = RoomMessage.objects.create(**validated_data)
 
             # Mark as read by sender automatically
-            MessageReadBy.objects.create(message=message, user=request.user)
+            MessageReadBy.objects.create(message=message, user_id=request.user.id)
 
             return message
 
@@ -84,6 +84,6 @@ class RoomMessageListSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         if request and request.user:
             return not MessageReadBy.objects.filter(
-                message=obj, user=request.user
+                message=obj, user_id=request.user.id
             ).exists()
         return True
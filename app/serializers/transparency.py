@@ -92,6 +92,12 @@ class TransparencyDetailsSerializer(serializers.ModelSerializer):
     def get_updated_at(self, obj):
         return obj.updated_at.strftime("%B %d, %Y")
 
+    def create(self, validated_data):
+        # The agency is passed as agency_id; its address fields are only
+        # edited through update()
+        validated_data.pop("agency", None)
+        return super().create(validated_data)
+
     def update(self, instance, validated_data):
         agency_data = validated_data.pop("agency", {})
         agency = instance.agency
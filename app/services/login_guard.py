@@ -0,0 +1,109 @@
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, hashers
+from django.core.cache import cache
+from rest_framework.exceptions import Throttled
+
+# At most PASSWORD_HASH_CONCURRENCY password hashes (PBKDF2) run at once in a
+# process; further attempts are shed with a 429 instead of waiting for a slot
+_hash_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_CONCURRENCY)
+
+
+def get_client_ip(request):
+    """
+    The address the nearest trusted proxy saw, i.e. the TRUSTED_PROXY_COUNT-th
+    X-Forwarded-For entry from the right; REMOTE_ADDR without proxies
+    """
+    proxies = settings.TRUSTED_PROXY_COUNT
+    forwarded_for = [
+        ip.strip()
+        for ip in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",")
+        if ip.strip()
+    ]
+    if proxies and len(forwarded_for) >= proxies:
+        return forwarded_for[-proxies]
+    return request.META.get("REMOTE_ADDR")
+
+
+def _attempt_keys(scope, account, ip):
+    return (
+        f"attempts:{scope}:account:{str(account).lower()}",
+        f"attempts:{scope}:ip:{ip}",
+    )
+
+
+def check_attempts(scope, account, ip):
+    """Raise Throttled when the account or the IP used up its failed attempts"""
+    account_key, ip_key = _attempt_keys(scope, account, ip)
+    counts = cache.get_many([account_key, ip_key])
+
+    if (
+        counts.get(account_key, 0) >= settings.LOGIN_MAX_ATTEMPTS_PER_ACCOUNT
+        or counts.get(ip_key, 0) >= settings.LOGIN_MAX_ATTEMPTS_PER_IP
+    ):
+        raise Throttled(wait=settings.LOGIN_ATTEMPT_WINDOW)
+
+
+def record_failed_attempt(scope, account, ip):
+    for key in _attempt_keys(scope, account, ip):
+        cache.add(key, 0, settings.LOGIN_ATTEMPT_WINDOW)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(key, 1, settings.LOGIN_ATTEMPT_WINDOW)
+
+
+def clear_attempts(scope, account):
+    account_key, _ = _attempt_keys(scope, account, None)
+    cache.delete(account_key)
+
+
+def _check_password(raw_password, encoded):
+    if encoded is None:
+        # Hash anyway so unknown accounts cost the same as wrong passwords
+        hashers.make_password(raw_password)
+        return False, None
+
+    upgraded = []
+    valid = hashers.check_password(
+        raw_password,
+        encoded,
+        setter=lambda raw: upgraded.append(hashers.make_password(raw)),
+    )
+    return valid, upgraded[0] if upgraded else None
+
+
+def check_password_bounded(raw_password, encoded):
+    """(valid, upgraded hash or None), or Throttled when no hash slot is free"""
+    if not _hash_slots.acquire(blocking=False):
+        raise Throttled(detail="Too many logins in progress, try again shortly.")
+
+    try:
+        return _check_password(raw_password, encoded)
+    finally:
+        _hash_slots.release()
+
+
+def authenticate_bounded(username, password):
+    """
+    Same lookup as ModelBackend.authenticate minus soft-deleted users, with
+    the hash check bounded by check_password_bounded. Hash upgrades are written with a targeted update so they do
+    not go through save() (and its token revocation signal).
+    """
+    User = get_user_model()
+    # Soft-deleted users stay active; they fail like an unknown account
+    user = User._default_manager.filter(
+        **{User.USERNAME_FIELD: username}, deleted_at__isnull=True
+    ).first()
+
+    valid, upgraded = check_password_bounded(password, user.password if user else None)
+    if not valid:
+        return None
+
+    if upgraded:
+        User._default_manager.filter(pk=user.pk).update(password=upgraded)
+        user.password = upgraded
+
+    return user
@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core import signing
+
+from app.enumeration.mfa import MFAMethod
+from app.services.sendgrid import SendGridService
+from app.services.twilio import TwilioService
+
+PENDING_LOGIN_SALT = "app.login.mfa_pending"
+
+
+def create_pending_login_token(user):
+    """
+    Signed, timestamped token carrying the user waiting for MFA verification.
+    Replaces the session handoff between LoginAPI and the MFA endpoints.
+    """
+    return signing.dumps({"user_id": user.id}, salt=PENDING_LOGIN_SALT)
+
+
+def get_pending_login_user_id(token):
+    """User id from a pending login token, None if missing, tampered or expired"""
+    if not token:
+        return None
+
+    try:
+        data = signing.loads(
+            token,
+            salt=PENDING_LOGIN_SALT,
+            max_age=settings.MFA_PENDING_LOGIN_TTL,
+        )
+    except signing.BadSignature:
+        # SignatureExpired is a subclass of BadSignature
+        return None
+
+    return data.get("user_id")
+
+
+def send_mfa_code(code, method, destination, login=False):
+    """Deliver a temporary code by SMS, voice or email"""
+    title = "Login Verification" if login else "MFA Verification"
+
+    if method == MFAMethod.SMS.value:
+        message = f"Your ReportWell verification code is: {code}"
+        TwilioService().send_sms(to=destination, from_=None, body=message)
+
+    elif method == MFAMethod.VOICE.value:
+        message = f'Your ReportWell verification code is: {" ".join(code)}. I repeat, your code is: {" ".join(code)}'
+        twiml = f"""
+            <?xml version="1.0" encoding="UTF-8"?>
+            <Response>
+                <Say voice="alice">{message}</Say>
+                <Pause length="2"/>
+                <Say voice="alice">{message}</Say>
+            </Response>
+        """
+        TwilioService().make_call(to=destination, twiml=twiml, from_=None)
+
+    elif method == MFAMethod.EMAIL.value:
+        content = f"""
+            <h2>ReportWell {title}</h2>
+            <p>Your verification code is: {code}</p>
+            <p>This code will expire in {settings.MFA_TEMP_CODE_TTL} seconds.</p>
+        """
+        SendGridService().send_email(
+            to_email=destination,
+            from_email=None,
+            subject=f"ReportWell {title} Code",
+            content=content,
+        )
@@ -238,7 +238,7 @@ class NotificationService:
         #             notification_map[notification_id].links.append({"type": "comment", "id": comment.id, "label": comment.content})
 
         if report_id_notifciation_map:
-            for report in Report.objects.filter(
+            for report in Report.active.filter(
                 id__in=report_id_notifciation_map.keys()
             ):
                 for notification_id in report_id_notifciation_map[report.id]:
@@ -0,0 +1,66 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Presence lives only in the cache: per user, the channel names of their open
+# sockets with the time each was last seen. Heartbeats refresh a socket's own
+# entry, so a crashed socket ages out on its own without touching the others.
+# Concurrent writes for one user can drop an entry; the socket's next
+# heartbeat puts it back.
+
+
+def presence_key(user_id):
+    return f"presence:{user_id}"
+
+
+def _live_channels(channels, now):
+    cutoff = now - settings.PRESENCE_TTL
+    return {name: seen for name, seen in (channels or {}).items() if seen > cutoff}
+
+
+async def _aset_channel(user_id, channel_name, connected):
+    """Add/refresh or drop one socket's entry; (was_online, is_online)"""
+    key = presence_key(user_id)
+    now = time.time()
+    channels = _live_channels(await cache.aget(key), now)
+    was_online = bool(channels)
+
+    if connected:
+        channels[channel_name] = now
+    else:
+        channels.pop(channel_name, None)
+
+    if channels:
+        await cache.aset(key, channels, settings.PRESENCE_TTL)
+    else:
+        await cache.adelete(key)
+    return was_online, bool(channels)
+
+
+async def amark_online(user_id, channel_name):
+    """Register a socket for the user, True if the user just came online"""
+    was_online, _ = await _aset_channel(user_id, channel_name, True)
+    return not was_online
+
+
+async def aheartbeat(user_id, channel_name):
+    """Keep the socket alive, True if the user had aged out and is back online"""
+    return await amark_online(user_id, channel_name)
+
+
+async def amark_offline(user_id, channel_name):
+    """Unregister a socket for the user, True if no live socket is left"""
+    _, is_online = await _aset_channel(user_id, channel_name, False)
+    return not is_online
+
+
+def get_online_user_ids(user_ids):
+    """Subset of user_ids with at least one live socket, one cache round-trip"""
+    keys = {presence_key(user_id): user_id for user_id in user_ids}
+    now = time.time()
+    return [
+        keys[key]
+        for key, channels in cache.get_many(list(keys)).items()
+        if _live_channels(channels, now)
+    ]
@@ -0,0 +1,53 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+from app.models.report_activities import ReportActivity
+from app.models.reports import Report
+from app.utils.helper import generateUniqueID
+
+# Rows per INSERT when recording activities in batches
+ACTIVITY_BATCH_SIZE = 500
+
+
+def adjust_activity_counts(deltas):
+    """Apply {report_id: delta} to Report.activity_count in a single UPDATE"""
+    deltas = {report_id: delta for report_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    Report.objects.filter(id__in=deltas).update(
+        activity_count=F("activity_count")
+        + Case(
+            *(When(id=report_id, then=Value(delta)) for report_id, delta in deltas.items()),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+
+
+@transaction.atomic
+def record_report_activities(activities):
+    """
+    Record many activities with one INSERT per ACTIVITY_BATCH_SIZE rows and
+    one counter UPDATE. `activities` are dicts with report_id, user_id and
+    content, so other services can queue audit entries and flush them once.
+    """
+    rows = [
+        ReportActivity(
+            id=generateUniqueID(),
+            report_id=activity["report_id"],
+            user_id=activity["user_id"],
+            content=activity["content"],
+        )
+        for activity in activities
+    ]
+    ReportActivity.objects.bulk_create(rows, batch_size=ACTIVITY_BATCH_SIZE)
+    adjust_activity_counts(Counter(row.report_id for row in rows))
+    return rows
+
+
+@transaction.atomic
+def delete_report_activity(activity):
+    activity.delete()
+    adjust_activity_counts({activity.report_id: -1})
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from app.models.report_schedules import ReportSchedule
+from app.models.reports import Report, ReportCategory
+
+REPORT_CATALOG_VERSION = 1
+
+# Agencies / reports touched in the current transaction, bumped on commit
+_pending = threading.local()
+
+
+def _generation_key(agency_id):
+    return f"report_catalog_generation:{agency_id}"
+
+
+def _catalog_key(agency_id, generation):
+    return f"report_catalog:v{REPORT_CATALOG_VERSION}:{agency_id}:{generation}"
+
+
+def get_catalog_generation(agency_id):
+    """
+    Current generation of the agency's catalog. Seeded from the clock, so a
+    counter evicted from the cache never comes back as an old value and
+    revives a stale catalog.
+    """
+    key = _generation_key(agency_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def _bump_generation(agency_id):
+    key = _generation_key(agency_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def _flush_pending():
+    agency_ids = getattr(_pending, "agency_ids", set())
+    report_ids = getattr(_pending, "report_ids", set())
+    _pending.agency_ids, _pending.report_ids = set(), set()
+
+    if report_ids:
+        agency_ids |= set(
+            Report.objects.filter(id__in=report_ids).values_list("agency_id", flat=True)
+        )
+    for agency_id in agency_ids:
+        _bump_generation(agency_id)
+
+
+def invalidate_report_catalog(agency_id=None, report_id=None):
+    """
+    Bump the catalog generation of an agency (or of a report's agency) once
+    the current transaction commits. Bumping after the commit means a reader
+    can't cache pre-commit rows under the new generation; everything touched
+    in one transaction is resolved and bumped together.
+    """
+    if not hasattr(_pending, "agency_ids"):
+        _pending.agency_ids, _pending.report_ids = set(), set()
+
+    if agency_id is not None:
+        _pending.agency_ids.add(agency_id)
+    if report_id is not None:
+        _pending.report_ids.add(report_id)
+
+    transaction.on_commit(_flush_pending)
+
+
+def build_report_catalog(agency_id):
+    """Report ids, names, domains, categories and schedule times of an agency"""
+    category_ids = defaultdict(list)
+    for report_id, category_id in Report.categories.through.objects.filter(
+        report__agency_id=agency_id
+    ).values_list("report_id", "reportcategory_id"):
+        category_ids[report_id].append(category_id)
+
+    schedule_times = defaultdict(list)
+    for report_id, schedule_time in (
+        ReportSchedule.objects.filter(report__agency_id=agency_id)
+        .order_by("schedule_time")
+        .values_list("report_id", "schedule_time")
+    ):
+        schedule_times[report_id].append(schedule_time)
+
+    reports = [
+        {
+            **report,
+            "category_ids": category_ids[report["id"]],
+            "schedule_times": schedule_times[report["id"]],
+        }
+        for report in Report.active.filter(agency_id=agency_id)
+        .order_by("name")
+        .values("id", "name", "domain", "schedule_type")
+    ]
+
+    return {
+        "reports": reports,
+        "categories": list(
+            ReportCategory.objects.filter(agency_id=agency_id).values(
+                "id", "name", "color", "agency_id"
+            )
+        ),
+        "domains": sorted({report["domain"] for report in reports}),
+    }
+
+
+def get_report_catalog(agency_id):
+    """The agency's catalog from the cache, rebuilt when its generation moved"""
+    key = _catalog_key(agency_id, get_catalog_generation(agency_id))
+    catalog = cache.get(key)
+    if catalog is None:
+        catalog = build_report_catalog(agency_id)
+        cache.set(key, catalog, settings.REPORT_CATALOG_TTL)
+    return catalog
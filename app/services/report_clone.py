@@ -0,0 +1,142 @@
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+
+from app.models.report_schedules import ReportSchedule
+from app.models.reports import Report, ReportCategory
+from app.services.report_schedules import (
+    ASSIGNMENT_BATCH_SIZE,
+    create_report_submissions,
+    get_report_school_ids,
+)
+from app.utils.helper import generateUniqueID
+
+
+def _shifted(value, shift):
+    return value + shift if value is not None and shift else value
+
+
+def _copy_row(instance, **changes):
+    """Unsaved copy of a model instance with a fresh id"""
+    instance.pk = generateUniqueID()
+    instance._state.adding = True
+    for attr, value in changes.items():
+        setattr(instance, attr, value)
+    return instance
+
+
+def get_target_category_ids(report_id, agency_id):
+    """
+    Category ids for the clone of a report. Within the agency the same
+    categories are reused; across agencies they are matched by name in the
+    target agency and the missing ones created in one insert.
+    """
+    categories = list(
+        ReportCategory.objects.filter(
+            id__in=Report.categories.through.objects.filter(
+                report_id=report_id
+            ).values("reportcategory_id")
+        ).values("id", "name", "color", "agency_id")
+    )
+    if all(category["agency_id"] == agency_id for category in categories):
+        return [category["id"] for category in categories]
+
+    by_name = dict(
+        ReportCategory.objects.filter(
+            agency_id=agency_id, name__in=[category["name"] for category in categories]
+        ).values_list("name", "id")
+    )
+    missing = [
+        ReportCategory(
+            id=generateUniqueID(),
+            name=category["name"],
+            color=category["color"],
+            agency_id=agency_id,
+        )
+        for category in categories
+        if category["name"] not in by_name
+    ]
+    ReportCategory.objects.bulk_create(missing)
+    by_name.update({category.name: category.id for category in missing})
+    return [by_name[category["name"]] for category in categories]
+
+
+@transaction.atomic
+def clone_report(
+    report_id,
+    agency_id=None,
+    edited_by_id=None,
+    name=None,
+    shift=None,
+    include_schools=False,
+):
+    """
+    Copy a report with its categories, schedules, scoring and submission
+    instruction using bulk inserts, without going through the serializers.
+
+    agency_id   clone into another agency (template libraries)
+    shift       relativedelta added to every date, e.g. relativedelta(years=1)
+                for the next school year
+    include_schools  also assign the clone to the original's schools (same
+                agency only, schools belong to an agency)
+    """
+    original = Report.active.select_related(
+        "scoring", "submission_instruction"
+    ).get(id=report_id)
+    scoring = original.get_scoring
+    instruction = original.get_instruction
+    source_id = original.id
+    source_agency_id = original.agency_id
+    agency_id = agency_id or source_agency_id
+
+    shift = shift or relativedelta()
+    report = _copy_row(
+        original,
+        name=name or f"{original.name} (Copy)",
+        agency_id=agency_id,
+        edited_by_id=edited_by_id,
+        approved=False,
+        activity_count=0,
+        due_date=_shifted(original.due_date, shift),
+        recurring_first_occurrence=_shifted(
+            original.recurring_first_occurrence, shift
+        ),
+    )
+    report.save(force_insert=True)
+
+    Report.categories.through.objects.bulk_create(
+        [
+            Report.categories.through(report_id=report.id, reportcategory_id=category_id)
+            for category_id in get_target_category_ids(source_id, agency_id)
+        ]
+    )
+
+    schedules = [
+        ReportSchedule(
+            id=generateUniqueID(),
+            report=report,
+            schedule_time=_shifted(schedule["schedule_time"], shift),
+            report_name=schedule["report_name"],
+        )
+        for schedule in ReportSchedule.objects.filter(report_id=source_id).values(
+            "schedule_time", "report_name"
+        )
+    ]
+    ReportSchedule.objects.bulk_create(schedules, batch_size=ASSIGNMENT_BATCH_SIZE)
+
+    if scoring is not None:
+        _copy_row(scoring, report=report).save(force_insert=True)
+    if instruction is not None:
+        _copy_row(instruction, report=report).save(force_insert=True)
+
+    submissions_created = 0
+    if include_schools and agency_id == source_agency_id:
+        submissions_created = create_report_submissions(
+            report,
+            get_report_school_ids(source_id),
+            [schedule.id for schedule in schedules],
+        )
+
+    return report, {
+        "schedules_created": len(schedules),
+        "submissions_created": submissions_created,
+    }
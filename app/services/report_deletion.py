@@ -0,0 +1,100 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from app.models.report_activities import ReportActivity
+from app.models.report_schedules import ReportSchedule
+from app.models.reports import Report
+from app.models.submissions import Submission, SubmissionMessage
+from app.models.transparency import TransparencyReport
+from app.services.report_catalog import invalidate_report_catalog
+from app.utils.helper import generateUniqueID
+
+# Seconds the progress of a deletion job stays readable
+REPORT_DELETION_PROGRESS_TTL = 24 * 60 * 60
+
+
+def _progress_key(job_id):
+    return f"report_deletion:{job_id}"
+
+
+def get_deletion_progress(job_id):
+    return cache.get(_progress_key(job_id))
+
+
+def _set_progress(job_id, progress):
+    progress["updated_at"] = timezone.now().isoformat()
+    cache.set(_progress_key(job_id), progress, REPORT_DELETION_PROGRESS_TTL)
+
+
+def tombstone_reports(report_ids):
+    """
+    Hide the reports right away and return (job_id, tombstoned ids); the rows
+    and everything under them are removed by delete_tombstoned_reports.
+    """
+    reports = Report.active.filter(id__in=report_ids)
+    rows = list(reports.values_list("id", "agency_id"))
+    if not rows:
+        return None, []
+
+    reports.update(deleted_at=timezone.now())
+    # update() sends no signals
+    for agency_id in {agency_id for _, agency_id in rows}:
+        invalidate_report_catalog(agency_id=agency_id)
+
+    job_id = generateUniqueID()
+    ids = [report_id for report_id, _ in rows]
+    _set_progress(
+        job_id, {"status": "queued", "report_ids": ids, "deleted": {}, "step": None}
+    )
+    return job_id, ids
+
+
+def _descendant_querysets(report_ids):
+    """
+    Rows under the reports, leaves first, so each chunk's delete() has
+    little left to cascade. Relations not listed here are still handled by
+    delete() following their on_delete.
+    """
+    return [
+        SubmissionMessage.objects.filter(
+            submission__report_schedule__report_id__in=report_ids
+        ),
+        Submission.objects.filter(report_schedule__report_id__in=report_ids),
+        ReportSchedule.objects.filter(report_id__in=report_ids),
+        TransparencyReport.objects.filter(report_id__in=report_ids),
+        ReportActivity.objects.filter(report_id__in=report_ids),
+        Report.objects.filter(id__in=report_ids, deleted_at__isnull=False),
+    ]
+
+
+def delete_tombstoned_reports(job_id, report_ids):
+    """
+    Delete tombstoned reports and their descendants in chunks of
+    REPORT_DELETE_CHUNK_SIZE rows. Each chunk goes through QuerySet.delete()
+    in its own transaction, so cascades and SET_NULL follow the models and
+    locks are held per chunk only. Safe to re-run with the same ids after a
+    crash.
+    """
+    chunk_size = settings.REPORT_DELETE_CHUNK_SIZE
+    progress = get_deletion_progress(job_id) or {"report_ids": report_ids}
+    progress.update(status="running", deleted={})
+
+    for queryset in _descendant_querysets(report_ids):
+        model = queryset.model
+        progress["step"] = model._meta.label
+
+        while True:
+            ids = list(queryset.values_list("pk", flat=True)[:chunk_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                _, deleted = model._base_manager.filter(pk__in=ids).delete()
+            for label, count in deleted.items():
+                progress["deleted"][label] = progress["deleted"].get(label, 0) + count
+            _set_progress(job_id, progress)
+
+    progress.update(status="done", step=None)
+    _set_progress(job_id, progress)
+    return progress["deleted"]
@@ -0,0 +1,248 @@
+from datetime import timedelta
+from itertools import count, islice, takewhile
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from app.enumeration import SubmissionStatus
+from app.models.report_schedules import ReportSchedule
+from app.models.reports import Report
+from app.models.submissions import Submission
+from app.services.report_catalog import invalidate_report_catalog
+from app.utils.helper import generateUniqueID
+
+# Rows per INSERT / schools per DELETE when (un)assigning reports
+ASSIGNMENT_BATCH_SIZE = 1000
+
+RECURRING_PERIOD_STEPS = {
+    "DAY": relativedelta(days=1),
+    "WEEK": relativedelta(weeks=1),
+    "MONTH": relativedelta(months=1),
+    "QUARTER": relativedelta(months=3),
+    "YEAR": relativedelta(years=1),
+}
+
+
+def get_report_school_ids(report_id):
+    """Schools the report is assigned to (assignments are its submissions)"""
+    return set(
+        Submission.objects.filter(report_schedule__report_id=report_id)
+        .values_list("school_id", flat=True)
+        .distinct()
+    )
+
+
+def create_report_submissions(report, school_ids, schedule_ids):
+    """Bulk-create one submission per school x schedule; rows created"""
+    submissions = [
+        Submission(
+            id=generateUniqueID(),
+            school_id=school_id,
+            report_schedule_id=schedule_id,
+            agency_id=report.agency_id,
+            status=SubmissionStatus.INCOMPLETED.value,
+            created_by_id=report.edited_by_id,
+        )
+        for school_id in school_ids
+        for schedule_id in schedule_ids
+    ]
+    Submission.objects.bulk_create(submissions, batch_size=ASSIGNMENT_BATCH_SIZE)
+    return len(submissions)
+
+
+def delete_report_schedules(schedule_ids):
+    """Delete schedules and their submissions with set-based deletes; rows deleted"""
+    if not schedule_ids:
+        return 0
+    Submission.objects.filter(report_schedule_id__in=schedule_ids).delete()
+    deleted, _ = ReportSchedule.objects.filter(id__in=schedule_ids).delete()
+    return deleted
+
+
+def sync_report_schedules(report, schedules_data):
+    """
+    Make the report's SPECIFIC_DATES schedules match `schedules_data`, diffed
+    in memory on schedule_time: one bulk_create, one bulk_update of
+    report_name and one delete, with submissions for the assigned schools
+    created/deleted the same way.
+    """
+    wanted = {
+        schedule_data["schedule_time"]: schedule_data.get("report_name")
+        or report.name
+        for schedule_data in schedules_data
+        if schedule_data and schedule_data.get("schedule_time")
+    }
+    existing = {
+        schedule.schedule_time: schedule
+        for schedule in report.schedules.only("id", "schedule_time", "report_name")
+    }
+
+    new_schedules = [
+        ReportSchedule(
+            id=generateUniqueID(),
+            report=report,
+            schedule_time=schedule_time,
+            report_name=report_name,
+        )
+        for schedule_time, report_name in wanted.items()
+        if schedule_time not in existing
+    ]
+
+    now = timezone.now()
+    renamed = []
+    for schedule_time, schedule in existing.items():
+        report_name = wanted.get(schedule_time)
+        if report_name is not None and report_name != schedule.report_name:
+            schedule.report_name = report_name
+            schedule.updated_at = now
+            renamed.append(schedule)
+
+    removed_ids = [
+        schedule.id
+        for schedule_time, schedule in existing.items()
+        if schedule_time not in wanted
+    ]
+
+    # Read the assignment before deleting, it lives on the submissions
+    school_ids = get_report_school_ids(report.id) if existing else set()
+
+    ReportSchedule.objects.bulk_create(new_schedules, batch_size=ASSIGNMENT_BATCH_SIZE)
+    ReportSchedule.objects.bulk_update(
+        renamed, ["report_name", "updated_at"], batch_size=ASSIGNMENT_BATCH_SIZE
+    )
+    delete_report_schedules(removed_ids)
+    submissions_created = create_report_submissions(
+        report, school_ids, [schedule.id for schedule in new_schedules]
+    )
+    # bulk_create/bulk_update send no signals
+    if new_schedules or renamed:
+        invalidate_report_catalog(agency_id=report.agency_id)
+
+    return {
+        "schedules_created": len(new_schedules),
+        "schedules_updated": len(renamed),
+        "schedules_deleted": len(removed_ids),
+        "submissions_created": submissions_created,
+    }
+
+
+def get_horizon_end(now=None):
+    """Schedules and submissions are only materialised up to this point"""
+    return (now or timezone.now()) + timedelta(
+        days=settings.REPORT_SCHEDULE_HORIZON_DAYS
+    )
+
+
+def iter_recurrence(report):
+    """
+    Occurrence datetimes of a RECURRING_DATES report, in order; open-ended
+    when recurring_occurrences is null. Each occurrence is computed from the
+    first one so month ends don't drift.
+    """
+    if report.schedule_type != "RECURRING_DATES":
+        return
+
+    step = RECURRING_PERIOD_STEPS.get((report.recurring_period or "").upper())
+    first = report.recurring_first_occurrence
+    if not step or not first or not report.recurring_interval:
+        return
+
+    if report.recurring_occurrences is None:
+        indexes = count()
+    else:
+        indexes = range(report.recurring_occurrences)
+    for index in indexes:
+        yield first + step * (report.recurring_interval * index)
+
+
+def expand_recurrence(report, until):
+    """Occurrence datetimes of a RECURRING_DATES report up to `until`"""
+    return list(
+        takewhile(lambda occurrence: occurrence <= until, iter_recurrence(report))
+    )
+
+
+def materialize_report_schedules(report, horizon_end=None, prune=False):
+    """
+    Create the report's missing ReportSchedule rows up to the horizon, plus a
+    submission per assigned school for each of them, with bulk inserts.
+    When the rule has no occurrence up to the horizon its first occurrence is
+    created anyway: assignments live on the submissions, so the report needs
+    a schedule for the schools to stay assigned until the horizon reaches it.
+    With prune=True, future schedules the rule no longer produces (the rule
+    was edited, or the report was switched from SPECIFIC_DATES) are deleted
+    along with their submissions; the schools stay assigned through the new
+    schedules.
+    """
+    horizon_end = horizon_end or get_horizon_end()
+    existing = dict(report.schedules.values_list("schedule_time", "id"))
+    # Read the assignment before pruning, it lives on the submissions
+    school_ids = get_report_school_ids(report.id) if existing else set()
+
+    occurrences = expand_recurrence(report, until=horizon_end)
+    if not occurrences:
+        occurrences = list(islice(iter_recurrence(report), 1))
+
+    new_schedules = [
+        ReportSchedule(
+            id=generateUniqueID(),
+            report=report,
+            schedule_time=occurrence,
+            report_name=report.name,
+        )
+        for occurrence in occurrences
+        if occurrence not in existing
+    ]
+    ReportSchedule.objects.bulk_create(new_schedules, batch_size=ASSIGNMENT_BATCH_SIZE)
+
+    schedules_deleted = 0
+    if prune and existing:
+        # Bounded by the latest schedule, the rule may be open-ended
+        occurrences = set(expand_recurrence(report, until=max(existing)))
+        now = timezone.now()
+        schedules_deleted = delete_report_schedules(
+            [
+                schedule_id
+                for schedule_time, schedule_id in existing.items()
+                if schedule_time > now and schedule_time not in occurrences
+            ]
+        )
+
+    submissions_created = create_report_submissions(
+        report, school_ids, [schedule.id for schedule in new_schedules]
+    )
+
+    # bulk_create sends no signals
+    if new_schedules:
+        invalidate_report_catalog(agency_id=report.agency_id)
+
+    return {
+        "schedules_created": len(new_schedules),
+        "schedules_deleted": schedules_deleted,
+        "submissions_created": submissions_created,
+    }
+
+
+def materialize_recurring_reports():
+    """
+    Move the rolling horizon forward for every recurring report, one
+    transaction per report. Nothing calls this periodically: it is run by
+    the materialize_report_schedules management command (cron).
+    """
+    horizon_end = get_horizon_end()
+    totals = {"reports": 0, "schedules_created": 0, "submissions_created": 0}
+
+    reports = Report.active.filter(
+        schedule_type="RECURRING_DATES",
+        recurring_first_occurrence__lte=horizon_end,
+    )
+    for report in reports.iterator():
+        with transaction.atomic():
+            summary = materialize_report_schedules(report, horizon_end=horizon_end)
+        totals["reports"] += 1
+        totals["schedules_created"] += summary["schedules_created"]
+        totals["submissions_created"] += summary["submissions_created"]
+
+    return totals
@@ -1,12 +1,35 @@
-from django.db.models import Count
+import hashlib
+from collections import defaultdict
+from datetime import datetime
 
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework import status
+from rest_framework.response import Response
+
+from app.enumeration import NotificationType
+from app.models.notifications import Notification
+from app.models.report_schedules import ReportSchedule
 from app.models.reports import Report
-from app.serializers.reports import ReportCategorySerializer
+from app.models.submissions import Submission
+from app.models.users import User
+from app.serializers.reports import (
+    ReportCategorySerializer,
+    ReportListSerializer,
+    get_assigned_schools_map,
+)
+from app.services.report_schedules import (
+    ASSIGNMENT_BATCH_SIZE,
+    create_report_submissions,
+    get_report_school_ids,
+)
+from app.utils.helper import generateUniqueID
+from app.utils.pagination import InvalidCursor, keyset_window
 
 
 def get_reports_with_multiple_submissions(req, selected_agency):
     reports = (
-        Report.objects.filter(agency=selected_agency)
+        Report.active.filter(agency=selected_agency)
         .annotate(submission_count=Count("schedules"))
         .filter(submission_count__gt=0)
         .prefetch_related(
@@ -47,3 +70,198 @@ def get_reports_with_multiple_submissions(req, selected_agency):
         }
         for report in reports
     ]
+
+
+def with_report_relations(queryset):
+    """Load everything ReportSerializer/ReportDetailSerializer nest, per page"""
+    return queryset.select_related(
+        "edited_by", "scoring", "submission_instruction"
+    ).prefetch_related("categories", "schedules")
+
+
+def list_reports(req, queryset, serializer_class):
+    """
+    Cursor-paginated report listing with a fixed number of queries per page.
+    ?lean=true switches to ReportListSerializer (no nested relations).
+    """
+    lean = req.query_params.get("lean", "").lower() in ("1", "true")
+    if lean:
+        serializer_class = ReportListSerializer
+    else:
+        queryset = with_report_relations(queryset)
+
+    try:
+        reports, next_cursor, _ = keyset_window(req, queryset)
+    except InvalidCursor as e:
+        return Response({"error": e.detail}, status=e.status_code)
+    context = {
+        "request": req,
+        "assigned_schools": get_assigned_schools_map([report.id for report in reports]),
+    }
+
+    return Response(
+        {
+            "results": serializer_class(reports, many=True, context=context).data,
+            "next_cursor": next_cursor,
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
+def get_report_etag(report_id):
+    """
+    Strong ETag for the report detail payload, or None if there is no such
+    report. One query over updated_at of the report and its schedules,
+    scoring, instruction and submissions; row counts catch deletes, which
+    don't move any max(updated_at). activity_count is bumped with update()
+    and is part of the payload, so it goes in too. The categories m2m has no
+    timestamps: its through rows go in as count plus max(id), and the
+    editor's id and name as they are serialized.
+    """
+    categories = (
+        Report.categories.through.objects.filter(report_id=OuterRef("pk"))
+        .order_by()
+        .values("report_id")
+        .annotate(last_id=Max("id"), total=Count("id"))
+    )
+    schedules = (
+        ReportSchedule.objects.filter(report_id=OuterRef("pk"))
+        .order_by()
+        .values("report_id")
+        .annotate(latest=Max("updated_at"), total=Count("id"))
+    )
+    submissions = (
+        Submission.objects.filter(report_schedule__report_id=OuterRef("pk"))
+        .order_by()
+        .values("report_schedule__report_id")
+        .annotate(latest=Max("updated_at"), total=Count("id"))
+    )
+    row = (
+        Report.active.filter(pk=report_id)
+        .annotate(
+            schedules_latest=Subquery(schedules.values("latest")),
+            schedules_total=Coalesce(Subquery(schedules.values("total")), 0),
+            submissions_latest=Subquery(submissions.values("latest")),
+            submissions_total=Coalesce(Subquery(submissions.values("total")), 0),
+            categories_last_id=Subquery(categories.values("last_id")),
+            categories_total=Coalesce(Subquery(categories.values("total")), 0),
+        )
+        .values_list(
+            "updated_at",
+            "activity_count",
+            "edited_by_id",
+            "edited_by__first_name",
+            "edited_by__last_name",
+            "edited_by__email",
+            "scoring__updated_at",
+            "submission_instruction__updated_at",
+            "schedules_latest",
+            "schedules_total",
+            "submissions_latest",
+            "submissions_total",
+            "categories_last_id",
+            "categories_total",
+        )
+        .first()
+    )
+    if row is None:
+        return None
+
+    version = "|".join(str(value) for value in (report_id, *row))
+    return '"%s"' % hashlib.md5(version.encode(), usedforsecurity=False).hexdigest()
+
+
+def get_school_user_mapping(school_ids):
+    """{user_id: [school ids]} for active users of the given schools, one query"""
+    mapping = defaultdict(list)
+    rows = User.schools.through.objects.filter(
+        school_id__in=school_ids, user__deleted_at=None
+    ).values_list("user_id", "school_id")
+    for user_id, school_id in rows:
+        mapping[user_id].append(school_id)
+    return mapping
+
+
+def build_assignment_notifications(report, school_ids, assigned):
+    """One (un)assignment notification per user of the affected schools"""
+    if assigned:
+        single_type = NotificationType.REPORT_ASSIGNMENT
+        multiple_type = NotificationType.MULTIPLE_REPORT_ASSIGNMENT
+        verb = "assigned to"
+    else:
+        single_type = NotificationType.REPORT_UNASSIGNMENT
+        multiple_type = NotificationType.MULTIPLE_REPORT_UNASSIGNMENT
+        verb = "removed from"
+
+    notifications = []
+    for user_id, user_school_ids in get_school_user_mapping(school_ids).items():
+        if len(user_school_ids) > 1:
+            description = f"Report {report.name} {verb} multiple schools"
+            notification_type = multiple_type
+        else:
+            description = f"Report {report.name} {verb} school {user_school_ids[0]}"
+            notification_type = single_type
+
+        notifications.append(
+            Notification(
+                id=generateUniqueID(),
+                description=description,
+                type=notification_type,
+                receiver_id=user_id,
+                report_id=report.id,
+                school_ids=sorted(user_school_ids),
+                created_at=datetime.now(),
+            )
+        )
+    return notifications
+
+
+def remove_report_schools(report, school_ids):
+    """Delete the report's submissions for the schools, chunked; rows deleted"""
+    school_ids = list(school_ids)
+    deleted = 0
+    for start in range(0, len(school_ids), ASSIGNMENT_BATCH_SIZE):
+        deleted += Submission.objects.filter(
+            report_schedule__report=report,
+            school_id__in=school_ids[start : start + ASSIGNMENT_BATCH_SIZE],
+        ).delete()[0]
+    return deleted
+
+
+def add_report_schools(report, school_ids):
+    """Create one submission per schedule for each school; rows created"""
+    schedule_ids = list(report.schedules.values_list("id", flat=True))
+    return create_report_submissions(report, school_ids, schedule_ids)
+
+
+def sync_report_schools(report, school_ids):
+    """
+    Make the report assigned to exactly `school_ids` with a set diff against
+    the current assignments. Returns (summary, notifications); the caller
+    sends the notifications.
+    """
+    wanted = set(school_ids)
+    existing = get_report_school_ids(report.id)
+    to_remove = existing - wanted
+    to_add = wanted - existing
+
+    notifications = []
+    removed_rows = 0
+    if to_remove:
+        removed_rows = remove_report_schools(report, to_remove)
+        notifications += build_assignment_notifications(report, to_remove, False)
+
+    added_rows = 0
+    if to_add:
+        added_rows = add_report_schools(report, to_add)
+        notifications += build_assignment_notifications(report, to_add, True)
+
+    summary = {
+        "schools_added": len(to_add),
+        "schools_removed": len(to_remove),
+        "schools_unchanged": len(existing & wanted),
+        "submissions_created": added_rows,
+        "submissions_deleted": removed_rows,
+        "notifications": len(notifications),
+    }
+    return summary, notifications
@@ -0,0 +1,13 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+
+def send_room_membership_event(user_id, room_id, event_type):
+    """
+    Tell the user's connected MessageConsumers to join ("room_joined") or
+    leave ("room_left") the chat_<room_id> group without reconnecting.
+    """
+    channel_layer = get_channel_layer()
+    async_to_sync(channel_layer.group_send)(
+        f"user_{user_id}", {"type": event_type, "room_id": room_id}
+    )
@@ -79,10 +79,10 @@ def filterSchoolReports(filter_type, filter_id):
     serializer = None
 
     if filter_type == FILTER_CONST.SUBMISSION_FILTER_BY_SCHOOL:
-        filtered_data = Submission.objects.filter(school_id=filter_id)
+        filtered_data = Submission.objects.active().filter(school_id=filter_id)
         serializer = SubmissionFilterBySchoolSerializer(filtered_data, many=True)
     elif filter_type == FILTER_CONST.SUBMISSION_FILTER_BY_REPORT:
-        filtered_data = Submission.objects.filter(report_id=filter_id)
+        filtered_data = Submission.objects.active().filter(report_id=filter_id)
         serializer = SubmissionFilterByReportSerializer(filtered_data, many=True)
 
     return serializer.data
@@ -1,6 +1,7 @@
-from django.db.models import Count
+from django.db.models import Count, Prefetch, Q
 
 from app.models.schools import School
+from app.models.submissions import Submission
 from app.serializers.reports import ReportCategorySerializer, ReportSerializer
 from app.serializers.submission_instructions import SubmissionInstructionSerializer
 
@@ -9,8 +10,14 @@ def get_schools_with_multiple_submissions(req, selected_agency):
 
     schools = (
         School.objects.filter(agency=selected_agency)
-        .annotate(submission_count=Count("submission"))
+        .annotate(
+            submission_count=Count(
+                "submission",
+                filter=Q(submission__report_schedule__report__deleted_at__isnull=True),
+            )
+        )
         .prefetch_related(
+            Prefetch("submission_set", queryset=Submission.objects.active()),
             "submission_set__report_schedule",
             "submission_set__report_schedule__report",
             "submission_set__report_schedule__report__categories",
@@ -61,10 +68,10 @@ def get_schools_with_multiple_submissions(req, selected_agency):
 
         school_data["report"] = (
             ReportSerializer(
-                school.submission_set.first().report_schedule.report,
+                submissions[0].report_schedule.report,
                 read_only=True,
             ).data
-            if school.submission_set.first()
+            if submissions
             else None
         )
 
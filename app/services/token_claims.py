@@ -0,0 +1,63 @@
+import hashlib
+
+from django.conf import settings
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+
+import app.constants.msg as MSG_CONST
+from app.services.user_cache import get_user_snapshot
+
+
+def school_membership_version(school_ids):
+    """Short, stable fingerprint of a user's school membership"""
+    joined = ",".join(sorted(str(school_id) for school_id in school_ids))
+    return hashlib.sha1(joined.encode()).hexdigest()[:12]
+
+
+def get_token_claims(user_id, compact=None):
+    """
+    Custom access token claims for a user, built from the cached user snapshot
+    (one query on a miss, invalidated with the user). None for unknown or
+    deleted users.
+
+    In compact mode the school id list is left out and only `schools_version`
+    is sent; clients fetch the list (current_user/) when the version changes.
+    """
+    snapshot = get_user_snapshot(user_id)
+    if snapshot is None:
+        return None
+
+    if compact is None:
+        compact = settings.JWT_COMPACT_CLAIMS
+
+    school_ids = snapshot["school_ids"]
+    return {
+        "user_id": snapshot["id"],
+        "email": snapshot["email"],
+        "role": snapshot["role"],
+        "agency": snapshot["agency_id"],
+        "schools": None if compact else (list(school_ids) or None),
+        "schools_version": school_membership_version(school_ids),
+    }
+
+
+def apply_token_claims(token, claims):
+    for claim, value in claims.items():
+        token[claim] = value
+    return token
+
+
+def get_tokens_for_user(user):
+    """
+    Refresh token and an access token carrying the custom claims. Raises
+    AuthenticationFailed (401) for users without claims (deleted meanwhile).
+    """
+    claims = get_token_claims(user.id)
+    if claims is None:
+        raise AuthenticationFailed(
+            MSG_CONST.MSG_USER_VALIDATION["does_not_exist"], code="user_not_found"
+        )
+
+    refresh = RefreshToken.for_user(user)
+    access_token = apply_token_claims(refresh.access_token, claims)
+    return refresh, access_token
@@ -0,0 +1,65 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+
+# Revocations live in the cache with a TTL equal to the remaining token
+# lifetime, so there is no table to grow or clean up. Use a shared cache
+# (Redis) when running more than one process.
+
+
+def revoked_jti_key(jti):
+    return f"revoked_jti:{jti}"
+
+
+def tokens_not_before_key(user_id):
+    return f"tokens_not_before:{user_id}"
+
+
+def revoke_token(token):
+    """Revoke a single token by jti until it would have expired anyway"""
+    ttl = int(token["exp"] - time.time())
+    if ttl > 0:
+        cache.set(revoked_jti_key(token[api_settings.JTI_CLAIM]), True, ttl)
+
+
+def revoke_user_tokens(user_id):
+    """
+    Revoke every token issued to the user before the current second. iat has
+    whole-second precision, so the stamp does too and is compared with <:
+    the tokens handed out right after the change (new password, new role)
+    must stay valid, which also keeps tokens minted earlier in that same
+    second.
+    """
+    cache.set(
+        tokens_not_before_key(user_id),
+        int(time.time()),
+        int(settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds()),
+    )
+
+
+def _revocation_keys(token):
+    return (
+        revoked_jti_key(token.get(api_settings.JTI_CLAIM)),
+        tokens_not_before_key(token.get(api_settings.USER_ID_CLAIM)),
+    )
+
+
+def _is_revoked(token, found):
+    jti_key, not_before_key = _revocation_keys(token)
+    if found.get(jti_key):
+        return True
+
+    not_before = found.get(not_before_key)
+    return not_before is not None and token.get("iat", 0) < not_before
+
+
+def is_token_revoked(token):
+    """One cache round trip: revoked jti or issued before the user's stamp"""
+    return _is_revoked(token, cache.get_many(_revocation_keys(token)))
+
+
+async def ais_token_revoked(token):
+    """is_token_revoked for async callers (websocket auth)"""
+    return _is_revoked(token, await cache.aget_many(_revocation_keys(token)))
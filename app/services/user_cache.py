@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.core.cache import cache
+from django.db.models import Q
+
+from app.models.users import User
+
+# Fields needed to act as the principal without loading the full User row
+USER_SNAPSHOT_FIELDS = [
+    "id",
+    "email",
+    "first_name",
+    "last_name",
+    "role",
+    "agency_id",
+    "is_active",
+]
+
+# Bump whenever the snapshot shape changes so stale entries are never read
+USER_SNAPSHOT_VERSION = 2
+
+
+def user_snapshot_key(user_id):
+    return f"user_snapshot:v{USER_SNAPSHOT_VERSION}:{user_id}"
+
+
+def load_user_snapshot(user_id):
+    """Read the snapshot fields and school ids for an active (non-deleted) user"""
+    snapshot = (
+        User.objects.filter(id=user_id, deleted_at=None)
+        .values(*USER_SNAPSHOT_FIELDS)
+        .annotate(
+            school_ids=ArrayAgg(
+                "schools__id", filter=Q(schools__isnull=False), distinct=True
+            )
+        )
+        .first()
+    )
+    if snapshot is not None:
+        snapshot["school_ids"] = snapshot["school_ids"] or []
+    return snapshot
+
+
+def get_user_snapshot(user_id):
+    """Get a cached snapshot of the user, falling back to the DB on a miss"""
+    key = user_snapshot_key(user_id)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = load_user_snapshot(user_id)
+        if snapshot is not None:
+            cache.set(key, snapshot, settings.USER_SNAPSHOT_TTL)
+    return snapshot
+
+
+class SnapshotUser:
+    """
+    The acting user: request.user and request.current_user for HTTP requests,
+    scope["user"] for websockets, built from the cached snapshot. The
+    snapshot fields are plain attributes, so reading them never queries.
+    Any other attribute (other fields, relations, methods such as
+    check_password or get_full_name) is read from the full User row, loaded
+    once on first use; get_user() returns that row for serializers and
+    save(). Attributes set here are not written to the row.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+    is_staff = False
+    is_superuser = False
+
+    def __init__(self, snapshot):
+        self.id = self.pk = snapshot["id"]
+        self.email = snapshot["email"]
+        self.first_name = snapshot["first_name"]
+        self.last_name = snapshot["last_name"]
+        self.role = snapshot["role"]
+        self.agency_id = snapshot["agency_id"]
+        self.is_active = snapshot["is_active"]
+        self.school_ids = snapshot.get("school_ids", [])
+        self._user = None
+
+    def __str__(self):
+        return self.email
+
+    def __eq__(self, other):
+        if not isinstance(other, (SnapshotUser, User)):
+            return NotImplemented
+        return self.id == other.pk
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def get_user(self):
+        """The full User row, loaded on first use"""
+        if self._user is None:
+            self._user = User.objects.get(id=self.id)
+        return self._user
+
+    def __getattr__(self, name):
+        # Only called for attributes that aren't snapshot fields
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.get_user(), name)
+
+
+def get_current_user(user_id):
+    """The acting user (a SnapshotUser), None if missing/deleted"""
+    if not user_id:
+        return None
+
+    snapshot = get_user_snapshot(user_id)
+    if snapshot is None:
+        return None
+
+    return SnapshotUser(snapshot)
+
+
+def invalidate_user_snapshot(user_id):
+    cache.delete(user_snapshot_key(user_id))
+
+
+def invalidate_user_snapshots(user_ids):
+    cache.delete_many([user_snapshot_key(user_id) for user_id in user_ids])
@@ -18,6 +18,21 @@ from app.models.notifications import Notification
 from app.utils.helper import generateUniqueID
 
 
+def get_message_users(current_user):
+    """
+    Users the current user can message and see: their agency for admins,
+    the users of their schools otherwise (never themselves)
+    """
+    if UserRole(current_user.role) in [UserRole.SUPER_ADMIN, UserRole.AGENCY_ADMIN]:
+        users = User.objects.filter(agency_id=current_user.agency_id, deleted_at=None)
+    else:
+        users = User.objects.filter(
+            schools__in=current_user.school_ids,
+            deleted_at=None,
+        )
+    return users.exclude(id=current_user.id)
+
+
 def get_notification_settings(userId):
 
     user = get_object_or_404(User, pk=userId)
@@ -0,0 +1,135 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django_tasks.backends.database import DatabaseBackend
+from django_tasks.backends.database.models import DBTaskResult
+from django_tasks.signals import task_finished
+
+from app.models.report_schedules import ReportSchedule
+from app.models.reports import Report, ReportCategory
+from app.models.room import RoomUser
+from app.models.users import User
+from app.services.report_catalog import invalidate_report_catalog
+from app.services.rooms import send_room_membership_event
+from app.services.token_revocation import revoke_user_tokens
+from app.services.user_cache import (
+    invalidate_user_snapshot,
+    invalidate_user_snapshots,
+)
+from app.utils.background_task import deliver_mfa_code
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    # Covers profile edits, soft_delete()/restore() and hard deletes
+    invalidate_user_snapshot(instance.id)
+
+
+# Claims baked into access tokens; changing them revokes the user's tokens
+TOKEN_CLAIM_FIELDS = ("role", "agency", "agency_id")
+
+
+@receiver(pre_save, sender=User)
+def detect_token_claims_change(sender, instance, update_fields=None, **kwargs):
+    instance._token_claims_changed = False
+    if instance._state.adding:
+        return
+    if update_fields is not None and not set(update_fields) & set(TOKEN_CLAIM_FIELDS):
+        return
+    previous = (
+        User.objects.filter(pk=instance.pk).values_list("role", "agency_id").first()
+    )
+    instance._token_claims_changed = previous not in (
+        None,
+        (instance.role, instance.agency_id),
+    )
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_on_credentials_change(sender, instance, **kwargs):
+    # set_password() keeps the raw password on _password until save() returns
+    if (
+        instance._password is not None
+        or instance.deleted_at is not None
+        or getattr(instance, "_token_claims_changed", False)
+    ):
+        revoke_user_tokens(instance.id)
+
+
+@receiver(m2m_changed, sender=User.schools.through)
+def invalidate_user_schools_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    # user.schools.* changes one user, school.users.* may touch many; a
+    # reverse clear() has no pk_set so collect the members before it runs
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_user_snapshot(instance.pk)
+    elif action in ("post_add", "post_remove"):
+        invalidate_user_snapshots(pk_set)
+    elif action == "pre_clear":
+        invalidate_user_snapshots(instance.users.values_list("id", flat=True))
+
+
+@receiver(post_save, sender=RoomUser)
+def sync_room_join(sender, instance, created, **kwargs):
+    if not created:
+        return
+
+    transaction.on_commit(
+        lambda: send_room_membership_event(
+            instance.user_id, instance.room_id, "room_joined"
+        )
+    )
+
+
+@receiver(post_delete, sender=RoomUser)
+def sync_room_leave(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: send_room_membership_event(
+            instance.user_id, instance.room_id, "room_left"
+        )
+    )
+
+
+@receiver(pre_save, sender=Report)
+def invalidate_previous_report_catalog(sender, instance, **kwargs):
+    # A report moved to another agency must also leave the old catalog
+    if instance._state.adding:
+        return
+    previous = (
+        Report.objects.filter(pk=instance.pk).values_list("agency_id", flat=True).first()
+    )
+    if previous != instance.agency_id:
+        invalidate_report_catalog(agency_id=previous)
+
+
+@receiver(post_save, sender=Report)
+@receiver(post_delete, sender=Report)
+@receiver(post_save, sender=ReportCategory)
+@receiver(post_delete, sender=ReportCategory)
+def invalidate_agency_report_catalog(sender, instance, **kwargs):
+    invalidate_report_catalog(agency_id=instance.agency_id)
+
+
+@receiver(post_save, sender=ReportSchedule)
+@receiver(post_delete, sender=ReportSchedule)
+def invalidate_schedule_report_catalog(sender, instance, **kwargs):
+    # Resolved to the agency on commit, once for every schedule touched
+    invalidate_report_catalog(report_id=instance.report_id)
+
+
+@receiver(m2m_changed, sender=Report.categories.through)
+def invalidate_report_categories_catalog(sender, instance, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_report_catalog(agency_id=instance.agency_id)
+
+
+@receiver(task_finished, sender=DatabaseBackend)
+def purge_mfa_code_task_args(sender, task_result, **kwargs):
+    # The task table outlives the code: drop the plaintext once it was sent
+    # (or failed to be, the user asks for a new code either way)
+    if task_result.task.module_path != deliver_mfa_code.module_path:
+        return
+    DBTaskResult.objects.filter(id=task_result.id).update(
+        args_kwargs={"args": [], "kwargs": {}}
+    )
@@ -0,0 +1,150 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+
+from app.authentication import ClaimsJWTAuthentication
+from app.middleware.analyzetoken import AnalyzeTokenMiddleware
+from app.middleware.token_auth import get_user as get_websocket_user
+from app.models.users import User
+from app.services.token_claims import get_tokens_for_user
+from app.services.user_cache import SnapshotUser, get_user_snapshot
+from app.utils.helper import generateUniqueID
+
+
+class ClaimsJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(
+            id=generateUniqueID(),
+            email="auth-test@example.com",
+            username="auth-test",
+            first_name="Auth",
+            last_name="Test",
+            role="Agency_User",
+            is_active=True,
+        )
+        self.client = APIClient()
+
+    def authenticate(self, user):
+        _, access_token = get_tokens_for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+    def test_authenticated_request(self):
+        self.authenticate(self.user)
+
+        response = self.client.get(reverse("user-me"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["email"], self.user.email)
+
+    def test_inactive_user_is_rejected(self):
+        self.authenticate(self.user)
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        cache.clear()
+
+        response = self.client.get(reverse("user-me"))
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_one_principal_per_request(self):
+        _, access_token = get_tokens_for_user(self.user)
+        request = RequestFactory().get(
+            "/api/users/me/", HTTP_AUTHORIZATION=f"Bearer {access_token}"
+        )
+        AnalyzeTokenMiddleware(lambda request: None).process_request(request)
+
+        user, _ = ClaimsJWTAuthentication().authenticate(Request(request))
+
+        self.assertIs(user, request.current_user)
+        self.assertIsInstance(request.current_user, SnapshotUser)
+        self.assertIsInstance(
+            async_to_sync(get_websocket_user)(str(access_token)), SnapshotUser
+        )
+
+    def test_missing_token_is_rejected(self):
+        response = self.client.get(reverse("user-me"))
+
+        self.assertEqual(response.status_code, 401)
+
+
+class ChangePasswordTokenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(
+            id=generateUniqueID(),
+            email="password-test@example.com",
+            username="password-test",
+            first_name="Password",
+            last_name="Test",
+            role="Agency_User",
+            is_active=True,
+        )
+        self.user.set_password("old-password-1")
+        self.user.save()
+        # Setting the first password stamped a revocation, start clean
+        cache.clear()
+        _, self.old_access = get_tokens_for_user(self.user)
+        self.client = APIClient()
+
+    def change_password(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.old_access}")
+        response = self.client.post(
+            reverse("change_password"),
+            {"currentPassword": "old-password-1", "newPassword": "new-password-2"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_returned_tokens_authenticate(self):
+        data = self.change_password()
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {data['access']}")
+        self.assertEqual(self.client.get(reverse("user-me")).status_code, 200)
+
+        self.client.credentials()
+        response = self.client.post(
+            reverse("token_refresh"), {"refresh": data["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_earlier_tokens_are_revoked(self):
+        # Minted a second before the change, iat has whole-second precision
+        self.old_access["iat"] -= 1
+        self.change_password()
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.old_access}")
+        self.assertEqual(self.client.get(reverse("user-me")).status_code, 401)
+
+
+class SnapshotUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(
+            id=generateUniqueID(),
+            email="snapshot-test@example.com",
+            username="snapshot-test",
+            first_name="Snapshot",
+            last_name="Test",
+            role="Agency_User",
+            phone_number="5550100",
+            is_active=True,
+        )
+        self.snapshot_user = SnapshotUser(get_user_snapshot(self.user.id))
+
+    def test_snapshot_fields_do_not_query(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.snapshot_user.email, self.user.email)
+            self.assertEqual(self.snapshot_user.role, "Agency_User")
+
+    def test_other_attributes_load_the_user_once(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.snapshot_user.phone_number, "5550100")
+            self.assertEqual(self.snapshot_user.get_full_name(), "Snapshot Test")
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.snapshot_user.no_such_attribute
@@ -0,0 +1,39 @@
+from unittest import mock
+
+from django.test import TestCase
+from django_tasks.backends.database.management.commands.db_worker import Worker
+from django_tasks.backends.database.models import DBTaskResult
+
+from app.utils.background_task import deliver_mfa_code
+
+
+class DeliverMfaCodeTests(TestCase):
+    def run_worker(self):
+        Worker(
+            queue_names=["default"],
+            interval=0,
+            batch=True,
+            backend_name="default",
+            startup_delay=False,
+        ).run_task(DBTaskResult.objects.get())
+
+    @mock.patch("app.utils.background_task.send_mfa_code")
+    def test_code_is_purged_from_the_task_table(self, send_mfa_code):
+        with self.captureOnCommitCallbacks(execute=True):
+            deliver_mfa_code.enqueue("123456", "EMAIL", "mfa-test@example.com")
+
+        self.run_worker()
+
+        send_mfa_code.assert_called_once_with(
+            "123456", "EMAIL", "mfa-test@example.com", login=False
+        )
+        self.assertNotIn("123456", str(DBTaskResult.objects.get().args_kwargs))
+
+    @mock.patch("app.utils.background_task.send_mfa_code", side_effect=RuntimeError)
+    def test_code_is_purged_when_delivery_fails(self, _):
+        with self.captureOnCommitCallbacks(execute=True):
+            deliver_mfa_code.enqueue("123456", "EMAIL", "mfa-test@example.com")
+
+        self.run_worker()
+
+        self.assertNotIn("123456", str(DBTaskResult.objects.get().args_kwargs))
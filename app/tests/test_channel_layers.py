@@ -0,0 +1,36 @@
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase
+
+from app.utils.channel_layers import InstrumentedInMemoryChannelLayer
+
+
+class InstrumentedInMemoryChannelLayerTests(SimpleTestCase):
+    def setUp(self):
+        self.layer = InstrumentedInMemoryChannelLayer(
+            slow_consumer_policy="drop_oldest", capacity=1
+        )
+
+    def send(self, group, times=1):
+        for _ in range(times):
+            async_to_sync(self.layer.group_send)(group, {"type": "chat.message"})
+
+    def test_group_counters_go_with_the_group(self):
+        async_to_sync(self.layer.group_add)("chat_room-1", "channel-a")
+        self.send("chat_room-1", times=2)
+        self.assertEqual(
+            self.layer.get_stats()["worst_groups"],
+            {"chat_room-1": {"sent": 2, "dropped": 1}},
+        )
+
+        async_to_sync(self.layer.group_discard)("chat_room-1", "channel-a")
+
+        stats = self.layer.get_stats()
+        self.assertEqual(stats["worst_groups"], {})
+        self.assertEqual(stats["totals"], {"sent": 2, "dropped": 1})
+        self.assertEqual(stats["by_prefix"], {"chat": {"sent": 2, "dropped": 1}})
+        self.assertEqual(dict(self.layer.stats), {})
+
+    def test_sends_to_empty_groups_leave_no_counters(self):
+        self.send("chat_room-2")
+
+        self.assertEqual(dict(self.layer.stats), {})
@@ -0,0 +1,45 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.models.users import User
+from app.utils.helper import generateUniqueID
+
+
+class LoginTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(
+            id=generateUniqueID(),
+            email="login-test@example.com",
+            username="login-test@example.com",
+            first_name="Login",
+            last_name="Test",
+            role="Agency_User",
+            is_active=True,
+        )
+        self.user.set_password("correct-password-1")
+        self.user.save()
+        self.client = APIClient()
+
+    def login(self):
+        return self.client.post(
+            reverse("login"),
+            {"email": self.user.email, "password": "correct-password-1"},
+            format="json",
+        )
+
+    def test_login(self):
+        response = self.login()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.data)
+
+    def test_soft_deleted_user_gets_invalid_credentials(self):
+        self.user.soft_delete()
+
+        response = self.login()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("access", response.data)
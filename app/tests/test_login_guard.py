@@ -0,0 +1,30 @@
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from app.services.login_guard import get_client_ip
+
+
+class GetClientIpTests(SimpleTestCase):
+    def request(self, forwarded_for=None):
+        extra = {"REMOTE_ADDR": "10.0.0.1"}
+        if forwarded_for is not None:
+            extra["HTTP_X_FORWARDED_FOR"] = forwarded_for
+        return RequestFactory().post("/api/auth/login/", **extra)
+
+    @override_settings(TRUSTED_PROXY_COUNT=0)
+    def test_forwarded_for_ignored_without_proxies(self):
+        self.assertEqual(get_client_ip(self.request("1.2.3.4")), "10.0.0.1")
+
+    @override_settings(TRUSTED_PROXY_COUNT=1)
+    def test_spoofed_entries_are_skipped(self):
+        # The client sent "1.2.3.4", the load balancer appended what it saw
+        request = self.request("1.2.3.4, 203.0.113.7")
+        self.assertEqual(get_client_ip(request), "203.0.113.7")
+
+    @override_settings(TRUSTED_PROXY_COUNT=2)
+    def test_chained_proxies(self):
+        request = self.request("1.2.3.4, 203.0.113.7, 10.0.0.2")
+        self.assertEqual(get_client_ip(request), "203.0.113.7")
+
+    @override_settings(TRUSTED_PROXY_COUNT=2)
+    def test_fewer_entries_than_proxies(self):
+        self.assertEqual(get_client_ip(self.request("203.0.113.7")), "10.0.0.1")
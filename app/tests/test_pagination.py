@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.db.models import FloatField, Value
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from app.models.reports import Report
+from app.utils.helper import generateUniqueID
+from app.utils.pagination import (
+    InvalidCursor,
+    encode_cursor,
+    keyset_window,
+    parse_keyset_cursor,
+)
+
+
+class ParseKeysetCursorTests(SimpleTestCase):
+    keys = ("created_at", "id")
+
+    def test_round_trip(self):
+        now = timezone.now()
+        cursor = encode_cursor([now.isoformat(), "report-1"])
+        self.assertEqual(
+            parse_keyset_cursor(Report.objects.all(), self.keys, cursor),
+            [now, "report-1"],
+        )
+
+    def test_annotation_keys(self):
+        queryset = Report.objects.annotate(rank=Value(0.5, output_field=FloatField()))
+        now = timezone.now()
+        cursor = encode_cursor([0.25, now.isoformat(), "report-1"])
+        self.assertEqual(
+            parse_keyset_cursor(queryset, ("rank", *self.keys), cursor),
+            [0.25, now, "report-1"],
+        )
+
+    def test_malformed_cursors(self):
+        for cursor in [
+            "not base64!",
+            encode_cursor(5),
+            encode_cursor([1]),
+            encode_cursor(["yesterday", "report-1"]),
+            encode_cursor([None, "report-1"]),
+            encode_cursor({"created_at": "2024-01-01T00:00:00Z"}),
+        ]:
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                parse_keyset_cursor(Report.objects.all(), self.keys, cursor)
+
+
+class KeysetWindowTests(TestCase):
+    def setUp(self):
+        # Three reports share a created_at, so the id has to break the tie
+        now = timezone.now()
+        created_at = [now, now, now, now - timedelta(hours=1), now + timedelta(hours=1)]
+        for index, timestamp in enumerate(created_at):
+            report = Report.objects.create(id=generateUniqueID(), name=f"{index}")
+            Report.objects.filter(id=report.id).update(created_at=timestamp)
+
+        self.expected = list(
+            Report.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def window(self, **params):
+        request = Request(APIRequestFactory().get("/", {"page_size": 2, **params}))
+        items, before, after = keyset_window(request, Report.objects.all())
+        return [item.id for item in items], before, after
+
+    def test_pages_back_without_gaps_or_repeats(self):
+        seen, params = [], {}
+        while True:
+            ids, before, _ = self.window(**params)
+            seen += ids
+            if before is None:
+                break
+            params = {"before": before}
+
+        self.assertEqual(seen, self.expected)
+
+    def test_after_returns_newer_rows_newest_first(self):
+        _, before, _ = self.window()
+        _, _, after = self.window(before=before)
+
+        ids, _, after_cursor = self.window(after=after)
+
+        self.assertEqual(ids, self.expected[:2])
+        self.assertIsNotNone(after_cursor)
@@ -0,0 +1,39 @@
+import time
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from app.services.presence import (
+    aheartbeat,
+    amark_offline,
+    amark_online,
+    get_online_user_ids,
+    presence_key,
+)
+
+
+class PresenceTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_online_until_last_socket_closes(self):
+        self.assertTrue(async_to_sync(amark_online)("user-1", "socket-a"))
+        self.assertFalse(async_to_sync(amark_online)("user-1", "socket-b"))
+
+        self.assertFalse(async_to_sync(amark_offline)("user-1", "socket-a"))
+        self.assertEqual(get_online_user_ids(["user-1", "user-2"]), ["user-1"])
+
+        self.assertTrue(async_to_sync(amark_offline)("user-1", "socket-b"))
+        self.assertEqual(get_online_user_ids(["user-1"]), [])
+
+    def test_crashed_socket_ages_out_alone(self):
+        stale = time.time() - settings.PRESENCE_TTL - 1
+        cache.set(presence_key("user-1"), {"crashed": stale}, settings.PRESENCE_TTL)
+        self.assertEqual(get_online_user_ids(["user-1"]), [])
+
+        # The live socket's heartbeat brings the user back
+        self.assertTrue(async_to_sync(aheartbeat)("user-1", "socket-a"))
+        self.assertFalse(async_to_sync(aheartbeat)("user-1", "socket-a"))
+        self.assertEqual(get_online_user_ids(["user-1"]), ["user-1"])
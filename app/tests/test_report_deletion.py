@@ -0,0 +1,100 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app.models.agencies import Agency
+from app.models.report_schedules import ReportSchedule
+from app.models.reports import Report
+from app.models.schools import School
+from app.models.submissions import Submission
+from app.models.users import User
+from app.services.token_claims import get_tokens_for_user
+from app.utils.helper import generateUniqueID
+
+
+class ReportTombstoneTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.agency = Agency.objects.create(id=generateUniqueID(), title="Agency")
+        self.user = User.objects.create(
+            id=generateUniqueID(),
+            email="deletion-test@example.com",
+            username="deletion-test",
+            first_name="Deletion",
+            last_name="Test",
+            role="Agency_Admin",
+            agency=self.agency,
+            is_active=True,
+        )
+        self.school = School.objects.create(
+            id=generateUniqueID(), name="School", agency=self.agency
+        )
+        self.report = Report.objects.create(
+            id=generateUniqueID(), name="Report", agency=self.agency
+        )
+        schedule = ReportSchedule.objects.create(
+            id=generateUniqueID(),
+            report=self.report,
+            schedule_time=timezone.now(),
+            report_name=self.report.name,
+        )
+        self.submission = Submission.objects.create(
+            school=self.school, report_schedule=schedule, status="pending"
+        )
+
+        self.client = APIClient()
+        _, access_token = get_tokens_for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+    def assert_hidden(self):
+        report_detail = self.client.get(reverse("report-detail", args=[self.report.id]))
+        self.assertEqual(report_detail.status_code, 404)
+
+        reports = self.client.get(reverse("report-list-create"))
+        self.assertNotIn(
+            self.report.id, [report["id"] for report in reports.data["results"]]
+        )
+
+        submission_detail = self.client.get(
+            reverse("submission-detail", args=[self.submission.id])
+        )
+        self.assertEqual(submission_detail.status_code, 404)
+
+        for url in [
+            reverse("submission-list-create"),
+            reverse("submission-school-list", args=[self.school.id]),
+            f"/api/schools/{self.school.id}/reports/",
+        ]:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).data, [])
+
+        by_school = self.client.get(reverse("submission-list-by-school"))
+        self.assertEqual(by_school.data[0]["submissions"], [])
+
+        glance = self.client.get(reverse("glance-dashboard"))
+        self.assertEqual(glance.data["status"]["pending"], 0)
+
+        outstanding = self.client.get(reverse("outstanding-reports-dashboard"))
+        self.assertEqual(outstanding.data["Pending"]["count"], 0)
+
+        overdue = self.client.get(reverse("overdue-reports-dashboard"))
+        self.assertEqual(overdue.data[0]["submission_count"], 0)
+
+    def test_visible_before_delete(self):
+        response = self.client.get(
+            reverse("submission-detail", args=[self.submission.id])
+        )
+        self.assertEqual(response.status_code, 200)
+
+        glance = self.client.get(reverse("glance-dashboard"))
+        self.assertEqual(glance.data["status"]["pending"], 1)
+
+    def test_hidden_everywhere_after_delete_request(self):
+        response = self.client.delete(reverse("report-detail", args=[self.report.id]))
+        self.assertEqual(response.status_code, 202)
+
+        # Rows are still there until the worker runs, only the tombstone is set
+        self.assertTrue(Submission.objects.filter(id=self.submission.id).exists())
+        self.assert_hidden()
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from app.models.agencies import Agency
+from app.models.reports import Report
+from app.models.schools import School
+from app.models.submissions import Submission
+from app.services.report_schedules import (
+    get_horizon_end,
+    materialize_report_schedules,
+)
+from app.services.reports import add_report_schools
+from app.utils.helper import generateUniqueID
+
+
+class MaterializeReportSchedulesTests(TestCase):
+    def setUp(self):
+        self.agency = Agency.objects.create(id=generateUniqueID(), title="Agency")
+        self.school = School.objects.create(
+            id=generateUniqueID(), name="School", agency=self.agency
+        )
+        self.now = timezone.now().replace(microsecond=0)
+
+    def create_report(self, first_occurrence, occurrences=None):
+        return Report.objects.create(
+            id=generateUniqueID(),
+            name="Weekly report",
+            agency=self.agency,
+            schedule_type="RECURRING_DATES",
+            recurring_period="WEEK",
+            recurring_interval=1,
+            recurring_occurrences=occurrences,
+            recurring_first_occurrence=first_occurrence,
+        )
+
+    def schedule_times(self, report):
+        return list(report.schedules.values_list("schedule_time", flat=True))
+
+    def test_open_ended_recurrence_fills_the_horizon(self):
+        report = self.create_report(self.now + timedelta(days=1))
+        horizon_end = self.now + timedelta(weeks=4)
+
+        materialize_report_schedules(report, horizon_end=horizon_end)
+
+        self.assertEqual(
+            self.schedule_times(report),
+            [self.now + timedelta(days=1, weeks=week) for week in range(4)],
+        )
+
+    def test_counted_recurrence_stops_at_its_count(self):
+        report = self.create_report(self.now + timedelta(days=1), occurrences=2)
+
+        materialize_report_schedules(report, horizon_end=self.now + timedelta(weeks=4))
+
+        self.assertEqual(len(self.schedule_times(report)), 2)
+
+    def test_assignment_before_the_horizon_reaches_the_report(self):
+        first_occurrence = get_horizon_end(self.now) + timedelta(days=7)
+        report = self.create_report(first_occurrence)
+
+        # Nothing falls inside the horizon, the first occurrence still exists
+        materialize_report_schedules(report, horizon_end=get_horizon_end(self.now))
+        self.assertEqual(self.schedule_times(report), [first_occurrence])
+
+        self.assertEqual(add_report_schools(report, [self.school.id]), 1)
+
+        # The horizon moves forward: the school gets the new occurrences too
+        summary = materialize_report_schedules(
+            report, horizon_end=first_occurrence + timedelta(weeks=2)
+        )
+        self.assertEqual(summary["schedules_created"], 2)
+        self.assertEqual(summary["submissions_created"], 2)
+        self.assertEqual(
+            Submission.objects.filter(
+                report_schedule__report=report, school=self.school
+            ).count(),
+            3,
+        )
+
+    def test_prune_keeps_the_assignment_of_an_open_ended_report(self):
+        report = self.create_report(self.now + timedelta(days=1))
+        materialize_report_schedules(report, horizon_end=self.now + timedelta(weeks=2))
+        add_report_schools(report, [self.school.id])
+
+        # The rule moves past the horizon: old dates go, the schools stay
+        report.recurring_first_occurrence = get_horizon_end(self.now) + timedelta(
+            days=3
+        )
+        report.save()
+        summary = materialize_report_schedules(
+            report, horizon_end=get_horizon_end(self.now), prune=True
+        )
+
+        self.assertEqual(summary["schedules_deleted"], 2)
+        self.assertEqual(
+            self.schedule_times(report), [report.recurring_first_occurrence]
+        )
+        self.assertEqual(
+            list(
+                Submission.objects.filter(report_schedule__report=report).values_list(
+                    "school_id", flat=True
+                )
+            ),
+            [self.school.id],
+        )
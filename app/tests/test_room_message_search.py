@@ -0,0 +1,75 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.models.room import Room, RoomUser
+from app.models.room_messages import RoomMessage
+from app.models.users import User
+from app.services.token_claims import get_tokens_for_user
+from app.utils.helper import generateUniqueID
+
+
+class RoomMessageSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(
+            id=generateUniqueID(),
+            email="search-test@example.com",
+            username="search-test",
+            first_name="Search",
+            last_name="Test",
+            role="Agency_User",
+            is_active=True,
+        )
+        self.room = self.create_room(self.user)
+        self.other_room = self.create_room()
+
+        self.client = APIClient()
+        _, access_token = get_tokens_for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+    def create_room(self, *users):
+        room = Room.objects.create(id=generateUniqueID())
+        for user in users:
+            RoomUser.objects.create(id=generateUniqueID(), room=room, user=user)
+        return room
+
+    def create_message(self, content, room=None):
+        return RoomMessage.objects.create(
+            id=generateUniqueID(),
+            room=room or self.room,
+            sender=self.user,
+            content=content,
+        )
+
+    def search(self, term, **params):
+        return self.client.get(reverse("room-message-search"), {"q": term, **params})
+
+    def test_only_messages_of_the_users_rooms(self):
+        message = self.create_message("The budget report is due")
+        self.create_message("Budget meeting moved", room=self.other_room)
+        self.create_message("Lunch is at noon")
+
+        response = self.search("budget")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [result["id"] for result in response.data["results"]], [message.id]
+        )
+
+    def test_highlight_escapes_message_content(self):
+        # ts_headline drops well-formed tags but keeps this one
+        self.create_message("budget <<img src=x onerror=alert(1)>")
+
+        response = self.search("budget")
+
+        highlight = response.data["results"][0]["highlight"]
+        self.assertNotIn("<img", highlight)
+        self.assertIn("&lt;img", highlight)
+        self.assertIn("<mark>budget</mark>", highlight)
+
+    def test_missing_term(self):
+        response = self.search("")
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,42 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app.services.token_revocation import (
+    ais_token_revoked,
+    is_token_revoked,
+    revoke_token,
+    revoke_user_tokens,
+)
+
+
+class TokenRevocationTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.token = AccessToken()
+        self.token["user_id"] = "user-1"
+
+    def test_not_revoked(self):
+        self.assertFalse(is_token_revoked(self.token))
+
+    def test_revoke_single_token(self):
+        revoke_token(self.token)
+        self.assertTrue(is_token_revoked(self.token))
+
+    def test_tokens_issued_before_the_stamp_are_revoked(self):
+        self.token["iat"] -= 1
+        revoke_user_tokens("user-1")
+        self.assertTrue(is_token_revoked(self.token))
+        self.assertTrue(async_to_sync(ais_token_revoked)(self.token))
+
+    def test_tokens_issued_after_the_change_are_kept(self):
+        revoke_user_tokens("user-1")
+        token = AccessToken()
+        token["user_id"] = "user-1"
+        self.assertFalse(is_token_revoked(token))
+        self.assertFalse(async_to_sync(ais_token_revoked)(token))
+
+    def test_other_users_tokens_are_kept(self):
+        revoke_user_tokens("user-2")
+        self.assertFalse(is_token_revoked(self.token))
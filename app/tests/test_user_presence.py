@@ -0,0 +1,50 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.models.agencies import Agency
+from app.models.users import User
+from app.services.presence import amark_online
+from app.services.token_claims import get_tokens_for_user
+from app.utils.helper import generateUniqueID
+
+
+class UserPresenceAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+        agency = Agency.objects.create(id=generateUniqueID(), title="Agency")
+        other_agency = Agency.objects.create(id=generateUniqueID(), title="Other")
+        self.admin = self.create_user("admin", "Agency_Admin", agency)
+        self.colleague = self.create_user("colleague", "Agency_User", agency)
+        self.outsider = self.create_user("outsider", "Agency_User", other_agency)
+
+        for user in [self.colleague, self.outsider]:
+            async_to_sync(amark_online)(user.id, f"socket-{user.id}")
+
+        self.client = APIClient()
+        _, access_token = get_tokens_for_user(self.admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+    def create_user(self, name, role, agency):
+        return User.objects.create(
+            id=generateUniqueID(),
+            email=f"presence-{name}@example.com",
+            username=f"presence-{name}",
+            first_name=name,
+            last_name="Test",
+            role=role,
+            agency=agency,
+            is_active=True,
+        )
+
+    def test_other_agencies_are_not_reported(self):
+        response = self.client.post(
+            reverse("user-presence"),
+            {"user_ids": [self.colleague.id, self.outsider.id]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["online"], [self.colleague.id])
@@ -1,11 +1,17 @@
 from django.urls import path
 
-from app.views.report_activities import ReportActivityAPI, ReportActivityDetailAPI
+from app.views.report_activities import (
+    ReportActivityAPI,
+    ReportActivityBatchAPI,
+    ReportActivityCountAPI,
+    ReportActivityDetailAPI,
+)
 from app.views.reports import (
     AgencyAdminReportAPI,
     ReportAPI,
     ReportBulkDeleteAPI,
     ReportCategoryAPI,
+    ReportDeletionStatusAPI,
     ReportDuplicateAPI,
     ReportPKAPI,
     ReportSchoolAssignAPI,
@@ -13,6 +19,16 @@ from app.views.reports import (
 
 urlpatterns = [
     # More specific routes first
+    path(
+        "activities/batch/",
+        ReportActivityBatchAPI.as_view(),
+        name="report-activity-batch",
+    ),
+    path(
+        "activities/count/",
+        ReportActivityCountAPI.as_view(),
+        name="report-activity-count",
+    ),
     path(
         "activities/<str:activity_id>/",
         ReportActivityDetailAPI.as_view(),
@@ -25,6 +41,11 @@ urlpatterns = [
         name="report-category-list-create",
     ),
     path("bulk/delete/", ReportBulkDeleteAPI.as_view(), name="report-bulk-delete"),
+    path(
+        "deletions/<str:job_id>/",
+        ReportDeletionStatusAPI.as_view(),
+        name="report-deletion-status",
+    ),
     path(
         "schools/assign/", ReportSchoolAssignAPI.as_view(), name="report-school-assign"
     ),
@@ -1,8 +1,13 @@
 from django.urls import path
 
-from app.views.room_messages import MarkMessageAsReadAPI, RoomMessagesAPI
+from app.views.room_messages import (
+    MarkMessageAsReadAPI,
+    RoomMessagesAPI,
+    RoomMessageSearchAPI,
+)
 
 urlpatterns = [
+    path("search/", RoomMessageSearchAPI.as_view(), name="room-message-search"),
     path("<str:room_id>/", RoomMessagesAPI.as_view(), name="room-message-list-create"),
     path(
         "<str:room_id>/mark-as-read/<str:message_id>/",
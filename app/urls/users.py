@@ -10,6 +10,7 @@ from app.views.users import (
     UserPKAPI,
     UserMFAContactAPI,
     UserMeAPI,
+    UserPresenceAPI,
 )
 
 urlpatterns = [
@@ -29,5 +30,6 @@ urlpatterns = [
     path("message_users/", MessageUsersAPI.as_view(), name="message-users"),
     path("mfa_contact/", UserMFAContactAPI.as_view(), name="user-mfa-contact"),
     path("me/", UserMeAPI.as_view(), name="user-me"),
+    path("online/", UserPresenceAPI.as_view(), name="user-presence"),
     path("<str:pk>/", UserPKAPI.as_view(), name="user-detail"),
 ]
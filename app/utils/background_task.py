@@ -1,10 +1,10 @@
 from asgiref.sync import sync_to_async
 from django_tasks import task
 
-
 from app.models.room import RoomUser
 from app.models.room_messages import RoomMessage, MessageReadBy
-from app.models.users import User
+from app.services.mfa import send_mfa_code
+from app.services.report_deletion import delete_tombstoned_reports
 from app.services.sendgrid import SendGridService
 from config.settings import DEFAULT_FROM_EMAIL
 
@@ -34,3 +34,17 @@ def send_email_to_room_users(message_id):
             subject=f"{full_name} sent you a message",
             content=f"{full_name} sent you a message: {message.content}",
         )
+
+
+@task
+def deliver_mfa_code(code, method, destination, login=False):
+    # Runs on the task worker so Twilio/SendGrid latency never holds a request.
+    # The code is generated and stored by the request, the worker only sends it;
+    # the stored args are blanked once it ran (purge_mfa_code_task_args)
+    send_mfa_code(code, method, destination, login=login)
+
+
+@task
+def delete_reports(job_id, report_ids):
+    # Chunked deletes of tombstoned reports, progress is kept in the cache
+    return delete_tombstoned_reports(job_id, report_ids)
@@ -0,0 +1,153 @@
+import logging
+import time
+from collections import Counter, defaultdict
+from copy import deepcopy
+
+from channels.exceptions import ChannelFull
+from channels.layers import InMemoryChannelLayer
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedInMemoryChannelLayer(InMemoryChannelLayer):
+    """
+    InMemoryChannelLayer that counts dropped/expired messages (in total, per
+    group prefix and per live group; a group's counters go when its last
+    member leaves) and applies a policy when a consumer falls behind (its
+    channel is full):
+
+    - drop_oldest: evict the oldest queued message to make room
+    - coalesce: replace queued events of the same type/room (read receipts,
+      presence, typing); other events fall back to drop_oldest
+    - disconnect: discard the backlog, remove the channel from its groups and
+      ask the consumer to close with a resync hint (see slow_consumer handlers)
+    """
+
+    SLOW_CONSUMER_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+    def __init__(
+        self,
+        slow_consumer_policy="disconnect",
+        coalesce_types=("read_receipt", "presence", "typing"),
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        if slow_consumer_policy not in self.SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {slow_consumer_policy}")
+        self.slow_consumer_policy = slow_consumer_policy
+        self.coalesce_types = set(coalesce_types)
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.totals = Counter()
+        self.by_prefix = defaultdict(Counter)
+        self.stats = defaultdict(Counter)
+
+    def _count(self, group, key, amount=1):
+        self.totals[key] += amount
+        self.by_prefix[group.split("_", 1)[0]][key] += amount
+        if self.groups.get(group):
+            self.stats[group][key] += amount
+
+    def _prune_stats(self):
+        for group in [group for group in self.stats if not self.groups.get(group)]:
+            del self.stats[group]
+
+    async def group_discard(self, group, channel):
+        await super().group_discard(group, channel)
+        if group not in self.groups:
+            self.stats.pop(group, None)
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), "Message is not a dict"
+        assert self.valid_group_name(group), "Invalid group name"
+        self._clean_expired()
+
+        for channel in list(self.groups.get(group, {}).keys()):
+            try:
+                await self.send(channel, message)
+                self._count(group, "sent")
+            except ChannelFull:
+                self._handle_slow_consumer(group, channel, message)
+
+    def _handle_slow_consumer(self, group, channel, message):
+        queue = self.channels[channel]
+
+        if self.slow_consumer_policy == "disconnect":
+            while not queue.empty():
+                queue.get_nowait()
+            self._remove_from_groups(channel)
+            queue.put_nowait(
+                (time.time() + self.expiry, {"type": "slow_consumer", "group": group})
+            )
+            self._count(group, "disconnected")
+            self._prune_stats()
+            logger.warning("Slow consumer %s disconnected from %s", channel, group)
+            return
+
+        if self.slow_consumer_policy == "coalesce" and self._coalesce(queue, message):
+            self._count(group, "coalesced")
+        else:
+            queue.get_nowait()
+            self._count(group, "dropped")
+            logger.warning("Dropped oldest message for %s in %s", channel, group)
+
+        queue.put_nowait((time.time() + self.expiry, deepcopy(message)))
+        self._count(group, "sent")
+
+    def _coalesce(self, queue, message):
+        """Remove queued events superseded by `message`, True if any were removed"""
+        if message.get("type") not in self.coalesce_types:
+            return False
+
+        def superseded(queued):
+            return queued.get("type") == message.get("type") and queued.get(
+                "room_id"
+            ) == message.get("room_id")
+
+        items = [queue.get_nowait() for _ in range(queue.qsize())]
+        kept = [item for item in items if not superseded(item[1])]
+        for item in kept:
+            queue.put_nowait(item)
+        return len(kept) < len(items)
+
+    def _clean_expired(self):
+        # Attribute expired messages to the groups the channel belonged to
+        # before the parent implementation evicts it from all of them
+        now = time.time()
+        for channel, queue in list(self.channels.items()):
+            expired = sum(1 for expires_at, _ in queue._queue if expires_at < now)
+            if not expired:
+                continue
+            for group, channels in list(self.groups.items()):
+                if channel in channels:
+                    self._count(group, "expired", expired)
+
+        super()._clean_expired()
+        self._prune_stats()
+
+    async def flush(self):
+        await super().flush()
+        self._reset_stats()
+
+    def get_stats(self, top=20):
+        """Totals, totals per group prefix (chat, user, ...) and the worst live groups"""
+
+        def losses(counter):
+            return counter["dropped"] + counter["expired"] + counter["disconnected"]
+
+        worst = sorted(
+            (item for item in self.stats.items() if losses(item[1])),
+            key=lambda item: losses(item[1]),
+            reverse=True,
+        )[:top]
+
+        return {
+            "policy": self.slow_consumer_policy,
+            "capacity": self.capacity,
+            "totals": dict(self.totals),
+            "by_prefix": {
+                prefix: dict(counter) for prefix, counter in self.by_prefix.items()
+            },
+            "worst_groups": {group: dict(counter) for group, counter in worst},
+        }
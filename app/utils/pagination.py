@@ -1,3 +1,9 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import APIException
 from rest_framework.pagination import PageNumberPagination
 
 
@@ -5,3 +11,115 @@ class CustomPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+def encode_cursor(values):
+    """Encode keyset values (list/dict) into an opaque URL-safe cursor"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, None if missing or malformed"""
+    if not cursor:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, TypeError):
+        return None
+
+
+def get_page_size(req, default=CustomPagination.page_size):
+    """Read page_size from the query string, clamped to CustomPagination limits"""
+    try:
+        page_size = int(req.query_params.get("page_size", default))
+    except (TypeError, ValueError):
+        page_size = default
+    return max(1, min(page_size, CustomPagination.max_page_size))
+
+
+class InvalidCursor(APIException):
+    status_code = 400
+    default_detail = "Invalid cursor"
+    default_code = "invalid_cursor"
+
+
+def _keyset_field(queryset, key):
+    annotation = queryset.query.annotations.get(key)
+    if annotation is not None:
+        return annotation.output_field
+    return queryset.model._meta.get_field(key)
+
+
+def parse_keyset_cursor(queryset, keys, cursor):
+    """
+    Keyset values of a cursor made by keyset_window for the same keys,
+    converted back to the fields' types. Raises InvalidCursor for anything
+    else (not base64/JSON, wrong length, unparseable values).
+    """
+    values = decode_cursor(cursor)
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise InvalidCursor()
+
+    try:
+        values = [
+            _keyset_field(queryset, key).to_python(value)
+            for key, value in zip(keys, values)
+        ]
+    except (DjangoValidationError, TypeError, ValueError):
+        raise InvalidCursor()
+
+    if any(value is None for value in values):
+        raise InvalidCursor()
+    return values
+
+
+def _keyset_filter(keys, values, lookup):
+    # (a, b, c) < (x, y, z) spelled out: a < x, or a = x and b < y, ...
+    condition = Q()
+    for index, key in enumerate(keys):
+        condition |= Q(
+            **dict(zip(keys[:index], values[:index])),
+            **{f"{key}__{lookup}": values[index]},
+        )
+    return condition
+
+
+def _keyset_cursor(item, keys):
+    values = [getattr(item, key) for key in keys]
+    return encode_cursor(
+        [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in values
+        ]
+    )
+
+
+def keyset_window(req, queryset, keys=("created_at", "id")):
+    """
+    Keyset page over `keys` (the last one unique), newest first, in either
+    direction: ?before=<cursor> (or ?cursor=) pages back to older rows,
+    ?after=<cursor> fetches rows newer than the cursor (polling). Returns
+    (items, before_cursor, after_cursor); before_cursor is None once the
+    oldest row has been returned. Raises InvalidCursor for a malformed cursor.
+    """
+    page_size = get_page_size(req)
+    after = req.query_params.get("after")
+    before = req.query_params.get("before") or req.query_params.get("cursor")
+
+    if after:
+        values = parse_keyset_cursor(queryset, keys, after)
+        queryset = queryset.filter(_keyset_filter(keys, values, "gt"))
+        # Closest newer rows first, then flipped back to newest first
+        items = list(queryset.order_by(*keys)[:page_size])[::-1]
+        has_older = True
+    else:
+        if before:
+            values = parse_keyset_cursor(queryset, keys, before)
+            queryset = queryset.filter(_keyset_filter(keys, values, "lt"))
+        items = list(queryset.order_by(*[f"-{key}" for key in keys])[: page_size + 1])
+        has_older = len(items) > page_size
+        items = items[:page_size]
+
+    before_cursor = _keyset_cursor(items[-1], keys) if items and has_older else None
+    after_cursor = _keyset_cursor(items[0], keys) if items else after
+    return items, before_cursor, after_cursor
@@ -12,6 +12,8 @@ from app.serializers.users import UserSerializer
 from app.serializers.reports import ReportSerializer
 
 from app.services.base import get_filtered_data, process_serializer
+from app.services.report_catalog import get_report_catalog
+from app.services.reports import list_reports
 from app.services.users import user_invitation, send_user_notifications
 
 from app.utils.pagination import CustomPagination
@@ -89,7 +91,7 @@ class AgencyUsersAPI(APIView):
         if send_invitation:
             new_user.is_active = False  # Set to Inactive when invitation is sent
             new_user.save()
-            inviting_user = req.user
+            inviting_user = req.user.get_user()
             user_invitation(req, new_user, inviting_user)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -170,7 +172,7 @@ class AgencyUserAPI(APIView):
                 user = User.objects.get(id=user_id, agency=pk, deleted_at=None)
                 user.is_active = False  # Set to Inactive when magic link is sent
                 user.save()
-                inviting_user = req.user
+                inviting_user = req.user.get_user()
                 user_invitation(req, user, inviting_user)
                 return Response(
                     {"message": "Magic link sent successfully"}, 
@@ -203,9 +205,11 @@ class AgencyUserAPI(APIView):
 
 class AgencyReportsAPI(APIView):
     def get(self, req, pk):
-        reports = Report.objects.filter(agency=pk)
-        serializer = ReportSerializer(reports, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Pickers only need ids, names, categories and schedule times
+        if req.query_params.get("catalog") == "true":
+            return Response(get_report_catalog(pk), status=status.HTTP_200_OK)
+
+        return list_reports(req, Report.active.filter(agency=pk), ReportSerializer)
 
 class AgencyBulkActionsAPI(APIView):
     @transaction.atomic
@@ -234,7 +238,7 @@ class AgencyBulkActionsAPI(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            inviting_user = req.user
+            inviting_user = req.user.get_user()
             success_count = 0
             
             for user in users:
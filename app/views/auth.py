@@ -1,5 +1,5 @@
 import base64
-from datetime import datetime, timedelta
+from datetime import timedelta
 from io import BytesIO
 from urllib.parse import urlparse
 
@@ -17,10 +17,9 @@ from rest_framework import generics, permissions, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 
-from app.enumeration.mfa import MFAMethod, PhoneVerificationMethod
+from app.enumeration.mfa import MFAMethod
 from app.enumeration.notification_type import NotificationType
 from app.models.notifications import Notification
 from app.serializers.auth import (
@@ -36,6 +35,15 @@ from app.serializers.auth import (
     ChangePasswordSerializer,
 )
 from app.serializers.users import UserSerializer
+from app.services.mfa import create_pending_login_token, get_pending_login_user_id
+from app.services.login_guard import (
+    check_attempts,
+    clear_attempts,
+    get_client_ip,
+    record_failed_attempt,
+)
+from app.services.token_claims import get_tokens_for_user
+from app.utils.background_task import deliver_mfa_code
 from app.services.users import generate_token_code, send_invitation_email
 from app.services.sendgrid import SendGridService
 from app.services.twilio import TwilioService
@@ -61,13 +69,12 @@ class LoginAPI(generics.GenericAPIView):
 
         # Check if user has MFA enabled
         if user.mfa_enabled and user.mfa_method:
-            # Store user ID in session for MFA verification
-            request.session["pending_user_id"] = user.id
-            request.session["login_timestamp"] = timezone.now().isoformat()
-
+            # Hand the pending login to the MFA endpoints as a signed token,
+            # no server-side session involved
             return Response(
                 {
                     "mfa_required": True,
+                    "mfa_token": create_pending_login_token(user),
                     "mfa_methods": user.mfa_method,
                     "message": "MFA verification required",
                 },
@@ -75,19 +82,7 @@ class LoginAPI(generics.GenericAPIView):
             )
 
         # If no MFA required, proceed with normal login
-        refresh = RefreshToken.for_user(user)
-        access_token = refresh.access_token
-
-        access_token["user_id"] = user.id
-        access_token["email"] = user.email
-        access_token["role"] = user.role
-        access_token["schools"] = None
-        access_token["agency"] = None
-
-        if user.schools.exists():
-            access_token["schools"] = list(user.schools.values_list("id", flat=True))
-        if user.agency is not None:
-            access_token["agency"] = user.agency.id
+        refresh, access_token = get_tokens_for_user(user)
 
         return Response(
             {
@@ -107,7 +102,11 @@ class LoginMFAVerifyAPI(APIView):
     @swagger_auto_schema(
         request_body={
             "type": "object",
-            "properties": {"code": {"type": "string"}, "method": {"type": "string"}},
+            "properties": {
+                "mfa_token": {"type": "string"},
+                "code": {"type": "string"},
+                "method": {"type": "string"},
+            },
         },
         responses={
             200: "MFA verification successful, login complete",
@@ -124,27 +123,18 @@ class LoginMFAVerifyAPI(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Get pending user from session
-        pending_user_id = request.session.get("pending_user_id")
-        login_timestamp = request.session.get("login_timestamp")
+        # Get pending user from the signed token issued by LoginAPI
+        pending_user_id = get_pending_login_user_id(request.data.get("mfa_token"))
 
-        if not pending_user_id or not login_timestamp:
-            return Response(
-                {"error": "No pending login session found"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        # Check if session is still valid (5 minutes)
-        login_time = datetime.fromisoformat(login_timestamp)
-        if timezone.now() - login_time > timedelta(minutes=5):
-            # Clear expired session
-            request.session.pop("pending_user_id", None)
-            request.session.pop("login_timestamp", None)
+        if not pending_user_id:
             return Response(
                 {"error": "Login session expired. Please login again."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        ip = get_client_ip(request)
+        check_attempts("mfa", pending_user_id, ip)
+
         try:
             user = User.objects.get(id=pending_user_id, deleted_at__isnull=True)
         except User.DoesNotExist:
@@ -167,29 +157,16 @@ class LoginMFAVerifyAPI(APIView):
             verification_successful = user.verify_backup_code(code)
 
         if not verification_successful:
+            record_failed_attempt("mfa", pending_user_id, ip)
             return Response(
                 {"error": "Invalid verification code"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Clear session data
-        request.session.pop("pending_user_id", None)
-        request.session.pop("login_timestamp", None)
+        clear_attempts("mfa", pending_user_id)
 
         # Generate tokens for successful login
-        refresh = RefreshToken.for_user(user)
-        access_token = refresh.access_token
-
-        access_token["user_id"] = user.id
-        access_token["email"] = user.email
-        access_token["role"] = user.role
-        access_token["schools"] = None
-        access_token["agency"] = None
-
-        if user.schools.exists():
-            access_token["schools"] = list(user.schools.values_list("id", flat=True))
-        if user.agency is not None:
-            access_token["agency"] = user.agency.id
+        refresh, access_token = get_tokens_for_user(user)
 
         return Response(
             {
@@ -208,9 +185,15 @@ class LoginMFASendCodeAPI(APIView):
     permission_classes = [AllowAny]
 
     @swagger_auto_schema(
-        request_body={"type": "object", "properties": {"method": {"type": "string"}}},
+        request_body={
+            "type": "object",
+            "properties": {
+                "mfa_token": {"type": "string"},
+                "method": {"type": "string"},
+            },
+        },
         responses={
-            200: "Code sent successfully",
+            202: "Code queued for delivery",
             400: "Bad request",
         },
     )
@@ -222,12 +205,12 @@ class LoginMFASendCodeAPI(APIView):
                 {"error": "Method is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Get pending user from session
-        pending_user_id = request.session.get("pending_user_id")
+        # Get pending user from the signed token issued by LoginAPI
+        pending_user_id = get_pending_login_user_id(request.data.get("mfa_token"))
 
         if not pending_user_id:
             return Response(
-                {"error": "No pending login session found"},
+                {"error": "Login session expired. Please login again."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
@@ -238,60 +221,29 @@ class LoginMFASendCodeAPI(APIView):
                 {"error": "Invalid session"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Generate and send code based on method
-        if method in [
-            MFAMethod.SMS.value,
-            MFAMethod.EMAIL.value,
-            MFAMethod.VOICE.value,
-        ]:
-            code = user.generate_temp_code()
-
-            if method in [MFAMethod.SMS.value, MFAMethod.VOICE.value]:
-                phone = user.mfa_phone if user.mfa_phone else user.phone_number
-                if not phone:
-                    return Response(
-                        {"error": "Phone number not found"},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
-
-                twilio_service = TwilioService()
-
-                if method == MFAMethod.SMS.value:
-                    message = f"Your ReportWell verification code is: {code}"
-                    twilio_service.send_sms(to=phone, from_=None, body=message)
-                else:  # VOICE
-                    message = f'Your ReportWell verification code is: {" ".join(code)}. I repeat, your code is: {" ".join(code)}'
-                    twiml = f"""
-                        <?xml version="1.0" encoding="UTF-8"?>
-                        <Response>
-                            <Say voice="alice">{message}</Say>
-                            <Pause length="2"/>
-                            <Say voice="alice">{message}</Say>
-                        </Response>
-                    """
-                    twilio_service.make_call(to=phone, twiml=twiml, from_=None)
-
-            elif method == MFAMethod.EMAIL.value:
-                email = user.mfa_email if user.mfa_email else user.email
-                sendgrid_service = SendGridService()
-                content = f"""
-                    <h2>ReportWell Login Verification</h2>
-                    <p>Your verification code is: {code}</p>
-                    <p>This code will expire in 60 seconds.</p>
-                """
-                sendgrid_service.send_email(
-                    to_email=email,
-                    from_email=None,
-                    subject="ReportWell Login Verification Code",
-                    content=content,
+        # Resolve the destination now, deliver the code on the task worker
+        # and acknowledge straight away
+        if method in [MFAMethod.SMS.value, MFAMethod.VOICE.value]:
+            destination = user.mfa_phone if user.mfa_phone else user.phone_number
+            if not destination:
+                return Response(
+                    {"error": "Phone number not found"},
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
-
+        elif method == MFAMethod.EMAIL.value:
+            destination = user.mfa_email if user.mfa_email else user.email
+        else:
             return Response(
-                {"message": f"Verification code sent via {method}"},
-                status=status.HTTP_200_OK,
+                {"error": "Invalid method"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        return Response({"error": "Invalid method"}, status=status.HTTP_400_BAD_REQUEST)
+        code = user.generate_temp_code()
+        deliver_mfa_code.enqueue(code, method, destination, login=True)
+
+        return Response(
+            {"message": f"Verification code is being sent via {method}"},
+            status=status.HTTP_202_ACCEPTED,
+        )
 
 
 class CurrentUserAPI(APIView):
@@ -319,11 +271,20 @@ class ChangePasswordAPI(generics.GenericAPIView):
             data=request.data, context={"request": request}
         )
         serializer.is_valid(raise_exception=True)
-        user = request.user
+        user = request.user.get_user()
         user.set_password(serializer.validated_data["newPassword"])
         user.save()
+
+        # Saving the new password revoked every earlier token, keep this
+        # client signed in with a fresh pair
+        refresh, access_token = get_tokens_for_user(user)
         return Response(
-            {"message": "Password changed successfully."}, status=status.HTTP_200_OK
+            {
+                "message": "Password changed successfully.",
+                "refresh": str(refresh),
+                "access": str(access_token),
+            },
+            status=status.HTTP_200_OK,
         )
 
 
@@ -672,7 +633,7 @@ class GenerateTOTPAPI(APIView):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        user = request.user
+        user = request.user.get_user()
         method = serializer.validated_data["method"]
 
         if method == MFAMethod.TOTP.value:
@@ -716,7 +677,7 @@ class VerifyTOTPAPI(APIView):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        user = request.user
+        user = request.user.get_user()
         code = serializer.validated_data["code"]
         method = serializer.validated_data["method"]
 
@@ -726,7 +687,7 @@ class VerifyTOTPAPI(APIView):
                 if user.mfa_method is None:
                     user.mfa_method = []
                 user.mfa_method.append(MFAMethod.TOTP.value)
-                user.save()
+                user.save(update_fields=["mfa_enabled", "mfa_method"])
 
                 # Generate backup codes
                 backup_codes = user.generate_backup_codes()
@@ -752,7 +713,7 @@ class VerifyTOTPAPI(APIView):
                 if user.mfa_method is None:
                     user.mfa_method = []
                 user.mfa_method.append(method)
-                user.save()
+                user.save(update_fields=["mfa_enabled", "mfa_method"])
 
                 # Generate backup codes
                 backup_codes = user.generate_backup_codes()
@@ -776,7 +737,7 @@ class SendMFACodeAPI(APIView):
     @swagger_auto_schema(
         request_body=SendMFACodeSerializer,
         responses={
-            200: "Code sent successfully",
+            202: "Code queued for delivery",
             400: "Bad request",
         },
     )
@@ -784,10 +745,8 @@ class SendMFACodeAPI(APIView):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        user = request.user
+        user = request.user.get_user()
         method = serializer.validated_data["method"]
-        code = user.generate_temp_code()
-
         if method in [MFAMethod.SMS.value, MFAMethod.VOICE.value]:
             phone = serializer.validated_data.get("phone")
             if not phone:
@@ -798,7 +757,7 @@ class SendMFACodeAPI(APIView):
                 )
             else:
                 user.mfa_phone = phone
-                user.save()
+                user.save(update_fields=["mfa_phone"])
 
             if phone is None:
                 return Response(
@@ -806,26 +765,7 @@ class SendMFACodeAPI(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            twilio_service = TwilioService()
-
-            if method == PhoneVerificationMethod.SMS.value:
-                # Send SMS
-                message = f"Your ReportWell verification code is: {code}"
-                twilio_service.send_sms(to=phone, from_=None, body=message)
-            else:  # VOICE
-                # Make voice call
-
-                message = f'Your ReportWell verification code is: {" ".join(code)}. I repeat, your code is: {" ".join(code)}'
-
-                twiml = f"""
-                    <?xml version="1.0" encoding="UTF-8"?>
-                    <Response>
-                        <Say voice="alice">{message}</Say>
-                        <Pause length="2"/>
-                        <Say voice="alice">{message}</Say>
-                    </Response>
-                """
-                twilio_service.make_call(to=phone, twiml=twiml, from_=None)
+            destination = phone
 
         elif method == MFAMethod.EMAIL.value:
             email = serializer.validated_data.get("email")
@@ -833,24 +773,23 @@ class SendMFACodeAPI(APIView):
                 email = user.mfa_email
             else:
                 user.mfa_email = email
-                user.save()
+                user.save(update_fields=["mfa_email"])
 
-            # Send Email
-            sendgrid_service = SendGridService()
-            content = f"""
-                <h2>ReportWell MFA Verification</h2>
-                <p>Your verification code is: {code}</p>
-                <p>This code will expire in 60 seconds.</p>
-            """
-            sendgrid_service.send_email(
-                to_email=email,
-                from_email=None,
-                subject="ReportWell MFA Verification Code",
-                content=content,
+            destination = email
+
+        else:
+            return Response(
+                {"error": "Invalid method"}, status=status.HTTP_400_BAD_REQUEST
             )
 
+        # The code is stored here, where it is verified; only the delivery
+        # happens on the task worker
+        code = user.generate_temp_code()
+        deliver_mfa_code.enqueue(code, method, destination)
+
         return Response(
-            {"message": f"Verification code sent via {method}", "method": method}
+            {"message": f"Verification code is being sent via {method}", "method": method},
+            status=status.HTTP_202_ACCEPTED,
         )
 
 
@@ -871,7 +810,7 @@ class VerifyBackupCodeAPI(APIView):
                 {"error": "Code is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        user = request.user
+        user = request.user.get_user()
         if user.verify_backup_code(code):
             return Response({"message": "Backup code verified successfully"})
 
@@ -895,7 +834,7 @@ class GenerateBackupCodesAPI(APIView):
     def post(self, request):
         try:
             # Generate new backup codes
-            backup_codes = request.user.generate_backup_codes()
+            backup_codes = request.user.get_user().generate_backup_codes()
 
             return Response(
                 {
@@ -928,7 +867,7 @@ class RemoveMFAPI(APIView):
                 {"error": "Method is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        user = request.user
+        user = request.user.get_user()
         if method == MFAMethod.TOTP.value:
             user.mfa_method = [m for m in user.mfa_method if m != MFAMethod.TOTP.value]
         elif method == MFAMethod.SMS.value:
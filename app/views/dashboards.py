@@ -1,4 +1,4 @@
-from django.db.models import Count, F, Max
+from django.db.models import Count, F, Max, Q
 from django.db.models.functions import ExtractMonth, ExtractYear
 from rest_framework import status
 from rest_framework.response import Response
@@ -9,6 +9,7 @@ from app.models.reports import Report
 from app.models.submissions import Submission
 from app.services.agencies import get_schools_by_agency
 from app.services.base import filterObjects
+from app.services.report_catalog import get_report_catalog
 
 
 class DashboardsGlanceAPI(APIView):
@@ -43,7 +44,7 @@ class DashboardsGlanceAPI(APIView):
                 base_filters["report_schedule__schedule_time__month"] = month
 
             # Get base queryset with common filters
-            base_submissions = filterObjects(base_filters, Submission)
+            base_submissions = filterObjects(base_filters, Submission).active()
 
             # Get submitted submissions from base queryset
             submitted_submissions = base_submissions.filter(
@@ -109,7 +110,14 @@ class DashboardsOverdueReportsAPI(APIView):
             schools_with_counts = (
                 School.objects.filter(id__in=school_ids)
                 .values("id", "name")
-                .annotate(submission_count=Count("submission"))
+                .annotate(
+                    submission_count=Count(
+                        "submission",
+                        filter=Q(
+                            submission__report_schedule__report__deleted_at__isnull=True
+                        ),
+                    )
+                )
                 .order_by("name")
             )
 
@@ -137,7 +145,7 @@ class DashboardsOutstandingReportsAPI(APIView):
             agency_id = token_data["agency"]
 
             # Get all submissions for this agency
-            submissions = Submission.objects.filter(agency_id=agency_id)
+            submissions = Submission.objects.active().filter(agency_id=agency_id)
 
             # Define the statuses we want to track
             status_categories = ["incompleted", "returned", "pending"]
@@ -175,7 +183,7 @@ class DashboardsOutstandingReportsAPI(APIView):
                 for report_data in report_counts:
                     report_id = report_data["report_schedule__report_id"]
                     try:
-                        report = Report.objects.get(id=report_id)
+                        report = Report.active.get(id=report_id)
                         report_name = report.name
                         response_data[status_key]["reports"][report_name] = {
                             "count": report_data["count"],
@@ -199,23 +207,22 @@ class DashboardsFilterValuesAPI(APIView):
             token_data = getattr(req, "token_data", None)
             agency_id = token_data["agency"]
 
-            # Get only id and name fields
-            reports = Report.objects.filter(agency_id=agency_id).values("id", "name")
+            # Reports and domains come from the cached report catalog
+            catalog = get_report_catalog(agency_id)
+            reports = [
+                {"id": report["id"], "name": report["name"]}
+                for report in catalog["reports"]
+            ]
             schools = School.objects.filter(agency_id=agency_id).values("id", "name")
-            domains = (
-                Report.objects.filter(agency_id=agency_id)
-                .values_list("domain", flat=True)
-                .distinct()
-            )
             teams = User.objects.filter(agency_id=agency_id, deleted_at=None).values(
                 "id", "first_name", "last_name"
             )
 
             return Response(
                 {
-                    "reports": list(reports),  # Convert QuerySet to list
+                    "reports": reports,
                     "schools": list(schools),  # Convert QuerySet to list
-                    "domains": list(domains),
+                    "domains": catalog["domains"],
                     "teams": list(teams),
                 },
                 status=status.HTTP_200_OK,
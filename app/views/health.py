@@ -1,3 +1,4 @@
+from channels.layers import get_channel_layer
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -20,6 +21,11 @@ def health_check(request):
         }
     }
     
+    # Channel layer delivery counters (dropped/expired/slow consumers)
+    channel_layer = get_channel_layer()
+    if hasattr(channel_layer, 'get_stats'):
+        health_status['channel_layer'] = channel_layer.get_stats()
+
     # Check LocalStack status if it's being used
     if mock_aws_service.use_localstack:
         try:
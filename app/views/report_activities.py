@@ -4,7 +4,13 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from app.models.report_activities import ReportActivity
+from app.models.reports import Report
 from app.serializers.report_activities import ReportActivitySerializer
+from app.services.report_activities import (
+    delete_report_activity,
+    record_report_activities,
+)
+from app.utils.pagination import InvalidCursor, keyset_window
 
 
 class ReportActivityAPI(APIView):
@@ -17,13 +23,22 @@ class ReportActivityAPI(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            activities = ReportActivity.objects.filter(
-                report_id=report_id
-            ).select_related("user")
+            activities = ReportActivity.objects.filter(report_id=report_id)
+            if user_id := req.query_params.get("user_id"):
+                activities = activities.filter(user_id=user_id)
 
-            serializer = ReportActivitySerializer(activities, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            items, before, after = keyset_window(
+                req, activities.select_related("user")
+            )
+
+            serializer = ReportActivitySerializer(items, many=True)
+            return Response(
+                {"results": serializer.data, "before": before, "after": after},
+                status=status.HTTP_200_OK,
+            )
 
+        except InvalidCursor as e:
+            return Response({"error": e.detail}, status=e.status_code)
         except Exception as e:
             return Response(
                 {"error": "An error occurred while fetching activities"},
@@ -36,8 +51,19 @@ class ReportActivityAPI(APIView):
             user_id = token_data["user_id"]
             serializer = ReportActivitySerializer(data=req.data)
             if serializer.is_valid():
-                serializer.save(user_id=user_id)
-                return Response(serializer.data, status=status.HTTP_201_CREATED)
+                (activity,) = record_report_activities(
+                    [
+                        {
+                            "report_id": serializer.validated_data["report"].id,
+                            "user_id": user_id,
+                            "content": serializer.validated_data["content"],
+                        }
+                    ]
+                )
+                return Response(
+                    ReportActivitySerializer(activity).data,
+                    status=status.HTTP_201_CREATED,
+                )
 
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -48,6 +74,84 @@ class ReportActivityAPI(APIView):
             )
 
 
+class ReportActivityBatchAPI(APIView):
+    """Record many activities of the current user in one request"""
+
+    def post(self, req):
+        try:
+            token_data = getattr(req, "token_data", None)
+            user_id = token_data["user_id"]
+
+            activities = req.data.get("activities", [])
+            if not isinstance(activities, list) or not all(
+                isinstance(activity, dict)
+                and activity.get("report")
+                and activity.get("content")
+                for activity in activities
+            ):
+                return Response(
+                    {"error": "activities must be a list of {report, content}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            # One existence query for the whole batch
+            report_ids = {activity["report"] for activity in activities}
+            known = set(
+                Report.active.filter(id__in=report_ids).values_list("id", flat=True)
+            )
+            if unknown := report_ids - known:
+                return Response(
+                    {"error": "Report not found", "report_ids": sorted(unknown)},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            activities = record_report_activities(
+                [
+                    {
+                        "report_id": activity["report"],
+                        "user_id": user_id,
+                        "content": activity["content"],
+                    }
+                    for activity in activities
+                ]
+            )
+            return Response(
+                {"created": [activity.id for activity in activities]},
+                status=status.HTTP_201_CREATED,
+            )
+
+        except Exception as e:
+            return Response(
+                {"error": "An error occurred while recording activities"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class ReportActivityCountAPI(APIView):
+    def get(self, req):
+        report_id = req.query_params.get("report_id")
+        if not report_id:
+            return Response(
+                {"error": "Report ID is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Maintained on write, never a COUNT(*) over the timeline
+        count = (
+            Report.active.filter(id=report_id)
+            .values_list("activity_count", flat=True)
+            .first()
+        )
+        if count is None:
+            return Response(
+                {"error": "Report not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response(
+            {"report_id": report_id, "count": count}, status=status.HTTP_200_OK
+        )
+
+
 class ReportActivityDetailAPI(APIView):
     def get(self, req, activity_id):
         try:
@@ -106,7 +210,7 @@ class ReportActivityDetailAPI(APIView):
                     status=status.HTTP_403_FORBIDDEN,
                 )
 
-            activity.delete()
+            delete_report_activity(activity)
             return Response(status=status.HTTP_204_NO_CONTENT)
 
         except Exception as e:
@@ -1,34 +1,48 @@
-from collections import defaultdict
-from datetime import datetime
-
+from dateutil.relativedelta import relativedelta
 from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 import app.constants.msg as MSG_CONST
-from app.enumeration import NotificationType, SubmissionStatus
-from app.models.notifications import Notification
+from app.enumeration.user_role import UserRole
 from app.models.reports import Report, ReportCategory
-from app.models.submissions import Submission
-from app.models.users import User
 from app.serializers.reports import (
     ReportCategorySerializer,
     ReportDetailSerializer,
     ReportSerializer,
+    get_assigned_schools_map,
 )
-from app.utils.helper import generateUniqueID
+from app.utils.background_task import delete_reports
 from app.utils.pagination import CustomPagination
 from app.views.notifications import notification_service
 from app.services.base import process_serializer
+from app.services.report_catalog import get_report_catalog, invalidate_report_catalog
+from app.services.report_clone import clone_report
+from app.services.report_deletion import get_deletion_progress, tombstone_reports
+from app.services.reports import (
+    build_assignment_notifications,
+    get_report_etag,
+    list_reports,
+    remove_report_schools,
+    sync_report_schools,
+)
+
+
+def queue_report_deletion(report_ids):
+    """Tombstone the reports and enqueue their chunked deletion after commit"""
+    job_id, deleted_ids = tombstone_reports(report_ids)
+    if job_id is not None:
+        transaction.on_commit(lambda: delete_reports.enqueue(job_id, deleted_ids))
+    return job_id, deleted_ids
 
 
 class ReportAPI(APIView):
-    def get(self, _):
-        reports = Report.objects.all()
-        serializer = ReportSerializer(reports, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    def get(self, req):
+        return list_reports(req, Report.active.all(), ReportSerializer)
 
     def post(self, req):
         serializer = ReportSerializer(data=req.data)
@@ -50,19 +64,19 @@ class ReportCategoryAPI(APIView):
         agency_id = None
         if token_data and "agency" in token_data:
             agency_id = token_data["agency"]
-        elif hasattr(req.user, "agency") and req.user.agency:
-            agency_id = req.user.agency.pk
-        categories = ReportCategory.objects.filter(agency_id=agency_id)
-        serializer = ReportCategorySerializer(categories, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        elif getattr(req.user, "agency_id", None):
+            agency_id = req.user.agency_id
+        return Response(
+            get_report_catalog(agency_id)["categories"], status=status.HTTP_200_OK
+        )
 
     def post(self, req):
         token_data = getattr(req, "token_data", None)
         agency_id = None
         if token_data and "agency" in token_data:
             agency_id = token_data["agency"]
-        elif hasattr(req.user, "agency") and req.user.agency:
-            agency_id = req.user.agency.pk
+        elif getattr(req.user, "agency_id", None):
+            agency_id = req.user.agency_id
         data = req.data.copy()
         data["agency_id"] = agency_id
         serializer = ReportCategorySerializer(data=data)
@@ -76,8 +90,8 @@ class ReportCategoryAPI(APIView):
         agency_id = None
         if token_data and "agency" in token_data:
             agency_id = token_data["agency"]
-        elif hasattr(req.user, "agency") and req.user.agency:
-            agency_id = req.user.agency.pk
+        elif getattr(req.user, "agency_id", None):
+            agency_id = req.user.agency_id
         updates = req.data.get("updates", [])
         deletes = req.data.get("deletes", [])
         adds = req.data.get("adds", [])
@@ -90,6 +104,7 @@ class ReportCategoryAPI(APIView):
                 ReportCategory.objects.filter(id=cat_id, agency_id=agency_id).update(
                     color=color
                 )
+                invalidate_report_catalog(agency_id=agency_id)
         # Delete categories
         if deletes:
             ReportCategory.objects.filter(id__in=deletes, agency_id=agency_id).delete()
@@ -114,25 +129,41 @@ class AgencyAdminReportAPI(APIView):
     def get(self, req):
         token_data = getattr(req, "token_data", None)
         agency = token_data["agency"]
-        queryset = Report.objects.filter(agency_id=agency)
-        serializer = ReportDetailSerializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        queryset = Report.active.filter(agency_id=agency)
+        return list_reports(req, queryset, ReportDetailSerializer)
 
 
 class ReportPKAPI(APIView):
     def get_report(self, _, pk):
-        return get_object_or_404(Report, pk=pk)
+        return get_object_or_404(Report.active, pk=pk)
+
+    def get(self, req, pk):
+        # Answer polls from the version query alone when nothing has changed
+        etag = get_report_etag(pk)
+        if etag is None:
+            raise Http404
+
+        if_none_match = req.headers.get("If-None-Match")
+        if if_none_match and (
+            if_none_match.strip() == "*" or etag in parse_etags(if_none_match)
+        ):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
 
-    def get(self, _, pk):
         report = self.get_report(self, pk)
         serializer = ReportSerializer(report)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(
+            serializer.data, status=status.HTTP_200_OK, headers={"ETag": etag}
+        )
 
     def delete(self, _, pk):
-        report = self.get_report(self, pk)
-        report.delete()
+        # Hidden now, rows are removed in chunks on the task worker
+        job_id, _ = queue_report_deletion([pk])
+        if job_id is None:
+            raise Http404
+
         return Response(
-            {"message": MSG_CONST.MSG_REPORT_DELETED}, status=status.HTTP_204_NO_CONTENT
+            {"message": MSG_CONST.MSG_REPORT_DELETED, "job_id": job_id},
+            status=status.HTTP_202_ACCEPTED,
         )
 
     def put(self, req, pk):
@@ -155,49 +186,64 @@ class ReportPKAPI(APIView):
 
 class ReportDuplicateAPI(APIView):
     def post(self, req, pk):
-        original_report = get_object_or_404(Report, id=pk)
-
-        # Get token data for the user
-        token_data = getattr(req, "token_data", None)
-        user_id = token_data.get("user_id") if token_data else None
-
-        # Serialize the original report (this includes all related objects)
-        serializer = ReportSerializer(original_report)
-        report_data = serializer.data
+        original = get_object_or_404(Report.active.only("id", "agency_id"), id=pk)
 
-        # Modify the data for duplication
-        report_data["name"] = f"{original_report.name} (Copy)"
-        report_data["approved"] = False
+        try:
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
 
-        # Remove ID fields to create new objects
-        report_data.pop("id", None)
-        if "scoring" in report_data and report_data["scoring"]:
-            report_data["scoring"].pop("id", None)
+            # Cloning into another agency (template libraries) is Super Admin only
+            agency_id = (
+                req.data.get("agency") or original.agency_id or current_user.agency_id
+            )
+            if (
+                agency_id != current_user.agency_id
+                and current_user.role != UserRole.SUPER_ADMIN.value
+            ):
+                return Response(
+                    {"error": "Not allowed to duplicate into this agency"},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
 
-        if (
-            "submission_instruction" in report_data
-            and report_data["submission_instruction"]
-        ):
-            report_data["submission_instruction"].pop("id", None)
+            # e.g. shift_years=1 to roll a report over to the next school year
+            try:
+                shift = relativedelta(
+                    years=int(req.data.get("shift_years") or 0),
+                    days=int(req.data.get("shift_days") or 0),
+                )
+            except (TypeError, ValueError):
+                return Response(
+                    {"error": "shift_years and shift_days must be integers"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-        if "schedules" in report_data:
-            for schedule in report_data["schedules"]:
-                schedule.pop("id", None)
+            report, summary = clone_report(
+                original.id,
+                agency_id=agency_id,
+                edited_by_id=current_user.id,
+                name=req.data.get("name"),
+                shift=shift,
+                include_schools=req.data.get("include_schools") in (True, "true"),
+            )
 
-        # Create the new report using the serializer
-        new_serializer = ReportSerializer(data=report_data)
-        if new_serializer.is_valid():
-            new_serializer.save(edited_by_id=user_id)
             return Response(
                 {
                     "message": "Report duplicated successfully",
-                    "new_report_id": new_serializer.instance.id,
-                    "new_report_name": new_serializer.instance.name,
+                    "new_report_id": report.id,
+                    "new_report_name": report.name,
+                    **summary,
                 },
                 status=status.HTTP_200_OK,
             )
-        else:
-            return Response(new_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            return Response(
+                {"error": "An error occurred while duplicating the report"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
 
 
 class ReportBulkDeleteAPI(APIView):
@@ -211,19 +257,16 @@ class ReportBulkDeleteAPI(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Get all reports that exist from the provided IDs
-            reports_to_delete = Report.objects.filter(id__in=report_ids)
-            deleted_ids = list(reports_to_delete.values_list("id", flat=True))
-
-            # Delete the reports
-            reports_to_delete.delete()
+            # Tombstone now, delete in chunks on the task worker
+            job_id, deleted_ids = queue_report_deletion(report_ids)
 
             return Response(
                 {
                     "message": "Reports deleted successfully",
                     "deleted_reports": deleted_ids,
+                    "job_id": job_id,
                 },
-                status=status.HTTP_200_OK,
+                status=status.HTTP_202_ACCEPTED,
             )
 
         except Exception as e:
@@ -233,6 +276,16 @@ class ReportBulkDeleteAPI(APIView):
             )
 
 
+class ReportDeletionStatusAPI(APIView):
+    def get(self, req, job_id):
+        progress = get_deletion_progress(job_id)
+        if progress is None:
+            return Response(
+                {"error": "Deletion job not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(progress, status=status.HTTP_200_OK)
+
+
 class ReportSchoolAssignAPI(APIView):
     def post(self, req):
         try:
@@ -246,7 +299,7 @@ class ReportSchoolAssignAPI(APIView):
                 )
 
             # Validate the report has all needed objects before allowing assignment
-            report = get_object_or_404(Report, id=report_id)
+            report = get_object_or_404(Report.active, id=report_id)
 
             # Check if report is complete - validate required fields
             if not all(
@@ -262,140 +315,20 @@ class ReportSchoolAssignAPI(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Get the report
             with transaction.atomic():
-                # Get existing school reports for this report
-                existing_schools = Submission.objects.filter(
-                    report_schedule__report=report
-                ).values_list("school_id", flat=True)
-
-                # Find schools to remove (schools that exist but are not in the new list)
-                schools_to_remove = set(existing_schools) - set(school_ids)
-
-                notifications = []
-                # Delete SchoolReport entries for removed schools
-                if schools_to_remove:
-                    # This is obsolete
-                    Submission.objects.filter(
-                        report_schedule__report=report, school_id__in=schools_to_remove
-                    ).delete()
-
-                    user_school_mapping = defaultdict(set)
-                    for user in User.objects.filter(
-                        schools__id__in=schools_to_remove, deleted_at=None
-                    ):
-                        for school in user.schools.filter(id__in=schools_to_remove):
-                            user_school_mapping[user.id].add(school.id)
-
-                    for user_id, school_ids in user_school_mapping.items():
-                        if len(school_ids) > 1:
-                            notifications.append(
-                                Notification(
-                                    id=generateUniqueID(),
-                                    description=f"Report {report.name} removed from multiple schools",
-                                    type=NotificationType.MULTIPLE_REPORT_UNASSIGNMENT,
-                                    receiver_id=user_id,
-                                    report_id=report_id,
-                                    school_ids=school_ids,
-                                    created_at=datetime.now(),
-                                )
-                            )
-
-                        else:
-                            notifications.append(
-                                Notification(
-                                    id=generateUniqueID(),
-                                    description=f"Report {report.name} removed from school {list(school_ids)[0]}",
-                                    type=NotificationType.REPORT_UNASSIGNMENT,
-                                    receiver_id=user_id,
-                                    report_id=report_id,
-                                    school_ids=school_ids,
-                                    created_at=datetime.now(),
-                                )
-                            )
-
-                # Find new schools to add
-                new_school_ids = set(school_ids) - set(existing_schools)
-                # Create new SchoolReport entries
-                school_reports = []
-
-                for school_id in new_school_ids:
-                    for report_schedule in report.schedules.all():
-                        school_reports.append(
-                            Submission(
-                                id=generateUniqueID(),
-                                school_id=school_id,
-                                report_schedule=report_schedule,
-                                agency_id=report.agency_id,
-                                status=SubmissionStatus.INCOMPLETED.value,
-                                created_at=datetime.now(),
-                                updated_at=datetime.now(),
-                                created_by_id=report.edited_by_id,
-                            )
-                        )
-
-                # Bulk create the new assignments
-                if school_reports:
-                    Submission.objects.bulk_create(school_reports)
-
-                    user_school_mapping = defaultdict(set)
-                    for user in User.objects.filter(
-                        schools__id__in=new_school_ids, deleted_at=None
-                    ):
-                        for school in user.schools.filter(id__in=new_school_ids):
-                            user_school_mapping[user.id].add(school.id)
-
-                    for user_id, school_ids in user_school_mapping.items():
-                        if len(school_ids) > 1:
-                            notifications.append(
-                                Notification(
-                                    id=generateUniqueID(),
-                                    description=f"Report {report.name} assigned to multiple schools",
-                                    type=NotificationType.MULTIPLE_REPORT_ASSIGNMENT,
-                                    receiver_id=user_id,
-                                    report_id=report_id,
-                                    school_ids=school_ids,
-                                    created_at=datetime.now(),
-                                )
-                            )
-
-                        else:
-                            notifications.append(
-                                Notification(
-                                    id=generateUniqueID(),
-                                    description=f"Report {report.name} assigned to school {list(school_ids)[0]}",
-                                    type=NotificationType.REPORT_ASSIGNMENT,
-                                    receiver_id=user_id,
-                                    report_id=report_id,
-                                    school_ids=school_ids,
-                                    created_at=datetime.now(),
-                                )
-                            )
-
-                if notifications:
-                    notification_service.create_notifications(
-                        notifications, create_batch=True
-                    )
-
-            # Get all assigned schools for response
-            all_school_reports = Submission.objects.filter(
-                report_schedule__report=report
-            ).select_related("school")
-
-            assigned_schools = [
-                {
-                    "id": sr.school.id,
-                    "name": sr.school.name,
-                    "assigned_at": sr.created_at,
-                }
-                for sr in all_school_reports
-            ]
+                summary, notifications = sync_report_schools(report, school_ids)
+                notification_service.create_notifications(
+                    notifications, create_batch=True
+                )
 
             return Response(
                 {
                     "message": "Schools assigned successfully",
                     "report_id": report_id,
-                    "assigned_schools": assigned_schools,
+                    "summary": summary,
+                    "assigned_schools": get_assigned_schools_map([report.id])[
+                        report.id
+                    ],
                 },
                 status=status.HTTP_200_OK,
             )
@@ -422,18 +355,7 @@ class ReportSchoolAssignAPI(APIView):
                 )
 
             # Get all assigned schools for this report
-            school_reports = Submission.objects.filter(
-                report_schedule__report_id=report_id
-            ).select_related("school")
-
-            assigned_schools = [
-                {
-                    "id": sr.school.id,
-                    "name": sr.school.name,
-                    "assigned_at": sr.created_at,
-                }
-                for sr in school_reports
-            ]
+            assigned_schools = get_assigned_schools_map([report_id])[report_id]
 
             return Response(
                 {"report_id": report_id, "assigned_schools": assigned_schools},
@@ -462,67 +384,28 @@ class ReportSchoolAssignAPI(APIView):
                     {"error": "No schools provided"}, status=status.HTTP_400_BAD_REQUEST
                 )
 
-            report = Report.objects.get(id=report_id)
-
-            # Delete the specified assignments
-            deleted_count = Submission.objects.filter(
-                report_schedule__report_id=report_id, school_id__in=school_ids
-            ).delete()[0]
-
-            # Get remaining assigned schools
-            remaining_school_reports = Submission.objects.filter(
-                report_schedule__report_id=report_id
-            ).select_related("school")
-
-            notifications = []
-
-            user_school_mapping = defaultdict(list)
-            for user in User.objects.filter(school_id__in=school_ids, deleted_at=None):
-                user_school_mapping[user.id].append(user.school_id)
-
-            for user_id, school_ids in user_school_mapping.items():
-                if len(school_ids) > 1:
-                    notifications.append(
-                        Notification(
-                            id=generateUniqueID(),
-                            description=f"Report {report.name} removed from multiple schools",
-                            type=NotificationType.MULTIPLE_REPORT_UNASSIGNMENT,
-                            receiver_id=user_id,
-                            report_id=report_id,
-                            school_ids=school_ids,
-                            created_at=datetime.now(),
-                        )
-                    )
-
-                else:
-                    notifications.append(
-                        Notification(
-                            id=generateUniqueID(),
-                            description=f"Report {report.name} removed from school {school_ids[0]}",
-                            type=NotificationType.REPORT_UNASSIGNMENT,
-                            receiver_id=user_id,
-                            report_id=report_id,
-                            school_ids=school_ids,
-                            created_at=datetime.now(),
-                        )
-                    )
-
-            notification_service.create_notifications(notifications, create_batch=True)
-
-            remaining_schools = [
-                {
-                    "id": sr.school.id,
-                    "name": sr.school.name,
-                    "assigned_at": sr.created_at,
-                }
-                for sr in remaining_school_reports
-            ]
+            report = Report.active.get(id=report_id)
+
+            with transaction.atomic():
+                deleted_count = remove_report_schools(report, set(school_ids))
+                notifications = build_assignment_notifications(
+                    report, set(school_ids), False
+                )
+                notification_service.create_notifications(
+                    notifications, create_batch=True
+                )
 
             return Response(
                 {
                     "message": f"{deleted_count} school assignments removed",
                     "report_id": report_id,
-                    "remaining_schools": remaining_schools,
+                    "summary": {
+                        "submissions_deleted": deleted_count,
+                        "notifications": len(notifications),
+                    },
+                    "remaining_schools": get_assigned_schools_map([report_id])[
+                        report_id
+                    ],
                 },
                 status=status.HTTP_200_OK,
             )
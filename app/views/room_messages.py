@@ -1,5 +1,6 @@
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
 from django.db.models import ExpressionWrapper, F, FloatField
 from django.db.models.functions import Extract
 from django.shortcuts import get_object_or_404
@@ -18,9 +19,25 @@ from app.serializers.room_messages import (
     RoomMessageSerializer,
 )
 from app.utils.helper import generateUniqueID
+from app.utils.pagination import InvalidCursor, keyset_window
 from app.utils.background_task import send_email_to_room_users
 from datetime import timedelta
 from django.conf import settings
+from django.utils.html import escape
+
+# Private-use characters Postgres wraps matches in; the headline is escaped
+# before they are turned into <mark> tags so message content can't inject HTML
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_STOP = "\ue001"
+
+
+def render_highlight(headline):
+    """HTML-escaped search headline with the matches wrapped in <mark>"""
+    return (
+        escape(headline)
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_STOP, "</mark>")
+    )
 
 
 class RoomMessagesAPI(APIView):
@@ -208,3 +225,82 @@ class MarkMessageAsReadAPI(APIView):
                 {"error": "An error occurred while processing your request"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class RoomMessageSearchAPI(APIView):
+    """Full-text search over the messages of rooms the current user belongs to"""
+
+    def get(self, request: Request):
+        try:
+            token_data = request.token_data
+            user_id = token_data["user_id"]
+
+            term = (request.query_params.get("q") or "").strip()
+            if not term:
+                return Response(
+                    {"error": "Search term is required"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            query = SearchQuery(term, search_type="websearch", config="english")
+
+            messages = (
+                RoomMessage.objects.filter(
+                    search_vector=query,
+                    room_id__in=RoomUser.objects.filter(user_id=user_id).values(
+                        "room_id"
+                    ),
+                )
+                .select_related("sender")
+                .annotate(
+                    rank=SearchRank(F("search_vector"), query),
+                    highlight=SearchHeadline(
+                        "content",
+                        query,
+                        config="english",
+                        start_sel=HIGHLIGHT_START,
+                        stop_sel=HIGHLIGHT_STOP,
+                        max_fragments=2,
+                    ),
+                )
+            )
+
+            if room_id := request.query_params.get("room_id"):
+                messages = messages.filter(room_id=room_id)
+
+            # Keyset pagination on (rank, timestamp, id), all descending
+            messages, next_cursor, _ = keyset_window(
+                request, messages, keys=("rank", "timestamp", "id")
+            )
+
+            return Response(
+                {
+                    "results": [
+                        {
+                            "id": message.id,
+                            "room_id": message.room_id,
+                            "sender": {
+                                "id": message.sender.id,
+                                "first_name": message.sender.first_name,
+                                "last_name": message.sender.last_name,
+                                "email": message.sender.email,
+                            },
+                            "content": message.content,
+                            "highlight": render_highlight(message.highlight),
+                            "rank": message.rank,
+                            "timestamp": message.timestamp,
+                        }
+                        for message in messages
+                    ],
+                    "next_cursor": next_cursor,
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        except InvalidCursor as e:
+            return Response({"error": e.detail}, status=e.status_code)
+        except Exception as e:
+            return Response(
+                {"error": "An error occurred while searching messages"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
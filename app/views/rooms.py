@@ -18,6 +18,24 @@ from app.serializers.room_messages import RoomMessageSerializer
 from app.utils.helper import generateUniqueID
 
 
+def broadcast_new_room(room_id, room_data, message_data, member_ids):
+    """
+    Notify every member of a new room once and send its first message once.
+    room_data already embeds the first message as last_message, so members
+    whose consumer has not joined chat_<room_id> yet still receive it.
+    """
+    channel_layer = get_channel_layer()
+    for member_id in member_ids:
+        async_to_sync(channel_layer.group_send)(
+            f"user_{member_id}", {"type": "create_room", "room": room_data}
+        )
+
+    async_to_sync(channel_layer.group_send)(
+        f"chat_{room_id}",
+        {"type": "chat_message", "room_id": room_id, **message_data},
+    )
+
+
 class AnnouncementAPI(APIView):
     @transaction.atomic
     def post(self, req):
@@ -29,9 +47,11 @@ class AnnouncementAPI(APIView):
             content = req.data.get("content", "")
 
             # Make sure user is Agency Admin
-            current_user = User.objects.get(
-                id=current_user_id, deleted_at=None
-            )
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
             if current_user.role != "Agency_Admin":
                 return Response(
                     {"error": "User is not an agency admin"},
@@ -39,7 +59,9 @@ class AnnouncementAPI(APIView):
                 )
 
             # Get all users from the agency
-            users = User.objects.filter(agency=current_user.agency, deleted_at=None)
+            users = User.objects.filter(
+                agency_id=current_user.agency_id, deleted_at=None
+            )
 
             req_announcement_category = req.data.get("announcement_category", None)
             db_announcement_category = AnnouncementCategory.objects.get(
@@ -68,7 +90,7 @@ class AnnouncementAPI(APIView):
 
             room_message = RoomMessage.objects.create(
                 room=room,
-                sender=current_user,
+                sender_id=current_user.id,
                 content=content,
             )
 
@@ -80,17 +102,9 @@ class AnnouncementAPI(APIView):
                 room, context={"user_id": current_user_id, "last_message": room_message}
             ).data
 
-            channel_layer = get_channel_layer()
-            for user in users:
-                async_to_sync(channel_layer.group_send)(
-                    f"user_{user.id}", {"type": "create_room", "room": room_data}
-                )
-
-                # Send message to the room
-                async_to_sync(channel_layer.group_send)(
-                    f"chat_{room.id}",
-                    {"type": "chat_message", "room_id": room.id, **message_data},
-                )
+            broadcast_new_room(
+                room.id, room_data, message_data, [user.id for user in users]
+            )
 
             return Response(room_data, status=status.HTTP_201_CREATED)
 
@@ -104,12 +118,15 @@ class AnnouncementAPI(APIView):
 class AnnouncementCategoryAPI(APIView):
     def get(self, req):
         try:
-            token_data = getattr(req, "token_data", None)
-            user_id = token_data["user_id"]
-            agency = User.objects.get(id=user_id, deleted_at=None).agency
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
+            agency_id = current_user.agency_id
 
             announcement_categories = AnnouncementCategory.objects.filter(
-                agency=agency, deleted_at__isnull=True
+                agency_id=agency_id, deleted_at__isnull=True
             )
             serializer = AnnouncementCategorySerializer(
                 announcement_categories, many=True
@@ -126,9 +143,12 @@ class AnnouncementCategoryAPI(APIView):
     @transaction.atomic
     def put(self, req):
         try:
-            token_data = getattr(req, "token_data", None)
-            user_id = token_data["user_id"]
-            agency = User.objects.get(id=user_id, deleted_at=None).agency
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
+            agency_id = current_user.agency_id
 
             updates = req.data.get("updates", [])
             deletes = req.data.get("deletes", [])
@@ -136,7 +156,7 @@ class AnnouncementCategoryAPI(APIView):
 
             for update in updates:
                 announcement_category = AnnouncementCategory.objects.get(
-                    id=update.get("id"), agency=agency
+                    id=update.get("id"), agency_id=agency_id
                 )
                 for attr, value in update.items():
                     if attr == "id":
@@ -148,7 +168,7 @@ class AnnouncementCategoryAPI(APIView):
 
             for delete_id in deletes:
                 announcement_category = AnnouncementCategory.objects.get(
-                    id=delete_id, agency=agency
+                    id=delete_id, agency_id=agency_id
                 )
                 announcement_category.delete()
 
@@ -156,10 +176,10 @@ class AnnouncementCategoryAPI(APIView):
                 announcement_category = AnnouncementCategory.objects.create(
                     name=add.get("name"),
                     color=add.get("color"),
-                    agency=agency,
+                    agency_id=agency_id,
                 )
 
-            announcement_categories = AnnouncementCategory.objects.filter(agency=agency)
+            announcement_categories = AnnouncementCategory.objects.filter(agency_id=agency_id)
             serializer = AnnouncementCategorySerializer(
                 announcement_categories, many=True
             )
@@ -194,24 +214,32 @@ class RoomAPI(APIView):
     @transaction.atomic
     def post(self, req):
         try:
-            token_data = getattr(req, "token_data", None)
-            current_user = User.objects.get(
-                id=token_data["user_id"], deleted_at=None
-            )
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
             user_ids = req.data.get("users", [])
             message = req.data.get("message", "")
             title = req.data.get("title", "")
 
-            room = Room.objects.create(title=title)
-            RoomUser.objects.create(room=room, user=current_user)
+            # Validate all members in one query, dropping unknown/deleted ids
+            member_ids = [current_user.id] + list(
+                User.objects.filter(id__in=set(user_ids), deleted_at=None)
+                .exclude(id=current_user.id)
+                .values_list("id", flat=True)
+            )
 
-            # Add other users to the room
-            for user_id in user_ids:
-                if user_id != current_user.id:  # Avoid adding current user twice
-                    RoomUser.objects.create(room=room, user_id=user_id)
+            room = Room.objects.create(title=title)
+            RoomUser.objects.bulk_create(
+                [
+                    RoomUser(id=generateUniqueID(), room=room, user_id=member_id)
+                    for member_id in member_ids
+                ]
+            )
 
             room_message = RoomMessage.objects.create(
-                id=generateUniqueID(), room=room, sender=current_user, content=message
+                id=generateUniqueID(), room=room, sender_id=current_user.id, content=message
             )
 
             room_data = RoomSerializer(
@@ -220,18 +248,7 @@ class RoomAPI(APIView):
 
             message_data = RoomMessageSerializer(room_message).data
 
-            channel_layer = get_channel_layer()
-            for user_id in user_ids:
-                # New room message
-                async_to_sync(channel_layer.group_send)(
-                    f"user_{user_id}", {"type": "create_room", "room": room_data}
-                )
-
-                # Send message to the room
-                async_to_sync(channel_layer.group_send)(
-                    f"chat_{room.id}",
-                    {"type": "chat_message", "room_id": room.id, **message_data},
-                )
+            broadcast_new_room(room.id, room_data, message_data, member_ids)
 
             return Response(room_data, status=status.HTTP_201_CREATED)
 
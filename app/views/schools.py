@@ -169,7 +169,7 @@ class AgencyAdminSchoolAPI(ListAPIView):
 
 class SchoolSubmissionAPI(APIView):
     def get(self, req, pk):
-        queryset = Submission.objects.filter(school_id=pk)
+        queryset = Submission.objects.active().filter(school_id=pk)
         serializer = SchoolSubmissionSerializer(queryset, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -241,7 +241,7 @@ class SchoolBulkImportAPI(APIView):
 
                         if entity == "Users":
                             # send invitation email
-                            inviting_user = request.user
+                            inviting_user = request.user.get_user()
                             token = generate_token_code(obj, inviting_user)
                             send_invitation_email(request, obj, inviting_user, token)
                     else:
@@ -45,7 +45,7 @@ class SubmissionAPI(APIView):
             "school_id": req.GET.get("school"),
             "due_date": req.GET.get("due_date"),
         }
-        data = filterObjects(fields, Submission)
+        data = filterObjects(fields, Submission).active()
         serializer = SubmissionCreateAndUpdateSerializer(data, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -69,7 +69,7 @@ class SubmissionPKAPI(APIView):
         return True
 
     def get_submission(self, _, pk):
-        return get_object_or_404(Submission, pk=pk)
+        return get_object_or_404(Submission.objects.active(), pk=pk)
 
     def get(self, _, pk):
         submission = self.get_submission(self, pk)
@@ -85,10 +85,13 @@ class SubmissionPKAPI(APIView):
         )
 
     def put(self, req, pk):
-        token_data = getattr(req, "token_data", None)
-        user = User.objects.get(id=token_data["user_id"], deleted_at=None)
+        user = req.current_user
+        if not user:
+            return Response(
+                {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+            )
 
-        submission = Submission.objects.get(id=pk)
+        submission = self.get_submission(req, pk)
         report = submission.report_schedule.report
         school = School.objects.get(id=submission.school.id)
 
@@ -151,7 +154,7 @@ class SubmissionPKAPI(APIView):
             req.data,
             success_status=status.HTTP_200_OK,
             status=new_submission_status,
-            updated_by=user,
+            updated_by_id=user.id,
             school=school,
             school_submission_date=school_submission_date,
             original_object=submission,
@@ -192,7 +195,7 @@ class SubmissionsBySchoolAPI(APIView):
 
     def get(self, _, school_pk):
         fields = {"school_id": school_pk}
-        data = filterObjects(fields, Submission)
+        data = filterObjects(fields, Submission).active()
         serializer = SubmissionSchoolDetailSerializer(data, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -217,11 +220,11 @@ class SubmissionMessageAPI(APIView):
 class SubmissionAssignedUserAPI(APIView):
     def post(self, req):
 
-        token_data = getattr(req, "token_data", None)
-        current_user_id = token_data["user_id"]
-
-        current_user = User.objects.get(id=current_user_id, deleted_at=None)
-
+        current_user = req.current_user
+        if not current_user:
+            return Response(
+                {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+            )
         current_user_role = current_user.role
 
         if current_user_role not in [
@@ -242,7 +245,7 @@ class SubmissionAssignedUserAPI(APIView):
         else:
             assigned_user = User.objects.get(id=assigned_user_id, deleted_at=None)
 
-        submissions = Submission.objects.filter(id__in=submission_ids)
+        submissions = Submission.objects.active().filter(id__in=submission_ids)
 
         for submission in submissions:
             submission.assigned_member = assigned_user
@@ -255,9 +258,11 @@ class SubmissionAssignedUserAPI(APIView):
 
 class SubmissionAssignEvaluatorAPI(APIView):
     def post(self, req):
-        token_data = getattr(req, "token_data", None)
-        current_user_id = token_data["user_id"]
-        current_user = User.objects.get(id=current_user_id, deleted_at=None)
+        current_user = req.current_user
+        if not current_user:
+            return Response(
+                {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+            )
         current_user_role = current_user.role
 
         if current_user_role not in [
@@ -284,7 +289,7 @@ class SubmissionAssignEvaluatorAPI(APIView):
                 ],
             )
 
-        submissions = Submission.objects.filter(id__in=submission_ids)
+        submissions = Submission.objects.active().filter(id__in=submission_ids)
         for submission in submissions:
             submission.evaluator = evaluator
             submission.save()
@@ -296,7 +301,7 @@ class SubmissionAssignEvaluatorAPI(APIView):
 
 class SubmissionDownloadAPI(APIView):
     def get(self, req, pk):
-        submission = get_object_or_404(Submission, pk=pk)
+        submission = get_object_or_404(Submission.objects.active(), pk=pk)
 
         # Use mock AWS service instead of direct boto3 calls
         s3_client = mock_aws_service.get_s3_client()
@@ -316,7 +321,7 @@ class SchoolSubmissionDownloadAPI(APIView):
         school = get_object_or_404(School, pk=pk)
 
         # Gather all submissions for this school
-        submissions = Submission.objects.filter(
+        submissions = Submission.objects.active().filter(
             school=school,
         ).exclude(status=SubmissionStatus.INCOMPLETED.value)
 
@@ -333,7 +338,7 @@ class SchoolSubmissionDownloadAPI(APIView):
 
 class ReportSubmissionDownloadAPI(APIView):
     def get(self, req, pk):
-        report = get_object_or_404(Report, schedules__id=pk)
+        report = get_object_or_404(Report.active, schedules__id=pk)
 
         # Gather all submissions for this report
         submissions = Submission.objects.filter(report_schedule__report=report).exclude(
@@ -14,7 +14,6 @@ from app.models.transparency import (
     TransparencySubFolder,
     TransparencyReport,
 )
-from app.models.users import User
 from app.serializers.transparency import (
     TransparencyDetailsSerializer,
     TransparencyFolderSerializer,
@@ -50,10 +49,11 @@ class TransparencyDetailsAPI(APIView):
 
     def put(self, req):
         try:
-            token_data = getattr(req, "token_data", None)
-            current_user = User.objects.get(
-                id=token_data["user_id"], deleted_at=None
-            )
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
             current_user_role = UserRole(current_user.role)
             if current_user_role != UserRole.AGENCY_ADMIN:
                 return Response(
@@ -62,7 +62,7 @@ class TransparencyDetailsAPI(APIView):
                 )
 
             transparency_detail_query = TransparencyDetail.objects.filter(
-                agency=current_user.agency
+                agency_id=current_user.agency_id
             )
 
             if transparency_detail_query.exists():
@@ -70,7 +70,7 @@ class TransparencyDetailsAPI(APIView):
                 return process_serializer(
                     TransparencyDetailsSerializer,
                     req.data,
-                    updated_by=current_user,
+                    updated_by_id=current_user.id,
                     success_status=status.HTTP_200_OK,
                     original_object=transparency_detail,
                 )
@@ -78,8 +78,8 @@ class TransparencyDetailsAPI(APIView):
             return process_serializer(
                 TransparencyDetailsSerializer,
                 req.data,
-                agency=current_user.agency,
-                updated_by=current_user,
+                agency_id=current_user.agency_id,
+                updated_by_id=current_user.id,
                 success_status=status.HTTP_200_OK,
             )
 
@@ -99,10 +99,12 @@ class TransparencyFolderAPI(APIView):
                     id=req.query_params.get("agency_id")
                 )
             else:
-                current_user = User.objects.get(
-                    id=token_data["user_id"], deleted_at=None
-                )
-                current_agency = current_user.agency
+                current_user = req.current_user
+                if not current_user:
+                    return Response(
+                        {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                    )
+                current_agency = current_user.agency_id
 
             folders = (
                 TransparencyFolder.objects.filter(agency=current_agency)
@@ -136,10 +138,11 @@ class TransparencyFolderAPI(APIView):
 
     def post(self, req):
         try:
-            token_data = getattr(req, "token_data", None)
-            current_user = User.objects.get(
-                id=token_data["user_id"], deleted_at=None
-            )
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
             current_user_role = UserRole(current_user.role)
 
             # Check if user is an agency admin
@@ -152,9 +155,9 @@ class TransparencyFolderAPI(APIView):
             return process_serializer(
                 TransparencyFolderSerializer,
                 req.data,
-                agency=current_user.agency,
-                created_by=current_user,
-                updated_by=current_user,
+                agency_id=current_user.agency_id,
+                created_by_id=current_user.id,
+                updated_by_id=current_user.id,
                 success_status=status.HTTP_201_CREATED,
             )
 
@@ -166,10 +169,11 @@ class TransparencyFolderAPI(APIView):
 
     def put(self, req, pk):
         try:
-            token_data = getattr(req, "token_data", None)
-            current_user = User.objects.get(
-                id=token_data["user_id"], deleted_at=None
-            )
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
             current_user_role = UserRole(current_user.role)
 
             if current_user_role != UserRole.AGENCY_ADMIN:
@@ -183,7 +187,7 @@ class TransparencyFolderAPI(APIView):
             return process_serializer(
                 TransparencyFolderSerializer,
                 req.data,
-                updated_by=current_user,
+                updated_by_id=current_user.id,
                 original_object=transparency_folder,
                 success_status=status.HTTP_200_OK,
             )
@@ -196,10 +200,11 @@ class TransparencyFolderAPI(APIView):
 
     def delete(self, req, pk):
         try:
-            token_data = getattr(req, "token_data", None)
-            current_user = User.objects.get(
-                id=token_data["user_id"], deleted_at=None
-            )
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
 
             current_user_role = UserRole(current_user.role)
 
@@ -225,10 +230,11 @@ class TransparencyFolderAPI(APIView):
 class TransparencyReportAPI(APIView):
     def post(self, req):
         try:
-            token_data = getattr(req, "token_data", None)
-            current_user = User.objects.get(
-                id=token_data["user_id"], deleted_at=None
-            )
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
             current_user_role = UserRole(current_user.role)
 
             sub_folder_id = req.data.get("sub_folder_id")
@@ -291,10 +297,11 @@ class TransparencyReportAPI(APIView):
 class TransparencySubFolderAPI(APIView):
     def post(self, req):
         try:
-            token_data = getattr(req, "token_data", None)
-            current_user = User.objects.get(
-                id=token_data["user_id"], deleted_at=None
-            )
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
             current_user_role = UserRole(current_user.role)
 
             if current_user_role != UserRole.AGENCY_ADMIN:
@@ -307,8 +314,8 @@ class TransparencySubFolderAPI(APIView):
                 TransparencySubFolderSerializer,
                 req.data,
                 folder_id=req.data["folder_id"],
-                created_by=current_user,
-                updated_by=current_user,
+                created_by_id=current_user.id,
+                updated_by_id=current_user.id,
                 success_status=status.HTTP_201_CREATED,
             )
 
@@ -320,10 +327,11 @@ class TransparencySubFolderAPI(APIView):
 
     def put(self, req, pk):
         try:
-            token_data = getattr(req, "token_data", None)
-            current_user = User.objects.get(
-                id=token_data["user_id"], deleted_at=None
-            )
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
             current_user_role = UserRole(current_user.role)
             if current_user_role != UserRole.AGENCY_ADMIN:
                 return Response(
@@ -336,7 +344,7 @@ class TransparencySubFolderAPI(APIView):
             return process_serializer(
                 TransparencySubFolderSerializer,
                 req.data,
-                updated_by=current_user,
+                updated_by_id=current_user.id,
                 original_object=transparency_sub_folder,
                 success_status=status.HTTP_200_OK,
             )
@@ -349,10 +357,11 @@ class TransparencySubFolderAPI(APIView):
 
     def delete(self, req, pk):
         try:
-            token_data = getattr(req, "token_data", None)
-            current_user = User.objects.get(
-                id=token_data["user_id"], deleted_at=None
-            )
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
 
             current_user_role = UserRole(current_user.role)
 
@@ -392,10 +401,11 @@ class TransparencySchoolsAPI(APIView):
 
     def put(self, req, pk):
         try:
-            token_data = getattr(req, "token_data", None)
-            current_user = User.objects.get(
-                id=token_data["user_id"], deleted_at=None
-            )
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+                )
             current_user_role = UserRole(current_user.role)
 
             if current_user_role != UserRole.AGENCY_ADMIN:
@@ -409,7 +419,7 @@ class TransparencySchoolsAPI(APIView):
             return process_serializer(
                 TransparencySchoolSerializer,
                 req.data,
-                updated_by=current_user,
+                updated_by_id=current_user.id,
                 success_status=status.HTTP_200_OK,
                 original_object=school,
             )
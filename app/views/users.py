@@ -15,13 +15,17 @@ from app.serializers.users import (
     UserSerializer,
 )
 
-from app.services.users import user_invitation, send_user_notifications
+from app.services.users import (
+    get_message_users,
+    send_user_notifications,
+    user_invitation,
+)
 from app.services.base import filterObjects
+from app.services.presence import get_online_user_ids
 
 from app.utils.pagination import CustomPagination
 from app.utils.helper import mask_email, mask_phone
 from app.enumeration.mfa import MFAMethod
-from app.enumeration.user_role import UserRole
 import app.constants.msg as MSG_CONST
 
 User = get_user_model()
@@ -101,7 +105,7 @@ class UserCreateAPI(APIView):
     @transaction.atomic
     def post(self, req):
         token_data = getattr(req, "token_data", None)
-        agency_id = token_data.get("agency", req.user.agency.pk)
+        agency_id = token_data.get("agency", req.user.agency_id)
         send_invite = req.data.pop("send_invite", False)
         
         req.data["agency"] = agency_id
@@ -121,7 +125,7 @@ class UserCreateAPI(APIView):
         send_user_notifications(new_user)
         
         if send_invite:
-            inviting_user = req.user
+            inviting_user = req.user.get_user()
             user_invitation(req, new_user, inviting_user)
         
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -142,32 +146,16 @@ class SuperAdminUsersAPI(APIView):
 class MessageUsersAPI(APIView):
     def get(self, req):
         try:
-            token_data = getattr(req, "token_data", None)
-            current_user_id = token_data["user_id"]
-            current_user = User.objects.get(id=current_user_id)
-
-            current_user_role = UserRole(current_user.role)
-
-            if current_user_role in [UserRole.SUPER_ADMIN, UserRole.AGENCY_ADMIN]:
-                users = (
-                    User.objects.filter(agency=current_user.agency, deleted_at=None)
-                    .exclude(id=current_user.id)
-                    .prefetch_related(
-                        Prefetch("schools", queryset=School.objects.only("id", "name"))
-                    )
-                )
-            else:
-                users = (
-                    User.objects.filter(
-                        schools__in=current_user.schools.all(),
-                        deleted_at=None,
-                    )
-                    .exclude(id=current_user.id)
-                    .prefetch_related(
-                        Prefetch("schools", queryset=School.objects.only("id", "name"))
-                    )
+            current_user = req.current_user
+            if not current_user:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
                 )
 
+            users = get_message_users(current_user).prefetch_related(
+                Prefetch("schools", queryset=School.objects.only("id", "name"))
+            )
+
             serializer = MessageUserSerializer(users, many=True)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -182,12 +170,12 @@ class UserMeAPI(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        user = request.user
+        user = request.user.get_user()
         serializer = UserSerializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def patch(self, request):
-        user = request.user
+        user = request.user.get_user()
         serializer = UserSerializer(user, data=request.data, partial=True)
         print(serializer.initial_data)
         if serializer.is_valid():
@@ -200,7 +188,7 @@ class UserMFAContactAPI(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
+        user = request.user.get_user()
         mfa_methods = user.mfa_method or []
         result = {}
         if MFAMethod.SMS in mfa_methods or MFAMethod.VOICE in mfa_methods:
@@ -208,3 +196,41 @@ class UserMFAContactAPI(APIView):
         if MFAMethod.EMAIL in mfa_methods:
             result["email"] = mask_email(user.mfa_email) if user.mfa_email else None
         return Response(result)
+
+
+class UserPresenceAPI(APIView):
+    """
+    Which of the given users currently have a live websocket; ids outside
+    the message users list (get_message_users) are never reported online
+    """
+
+    def post(self, request):
+        current_user = request.current_user
+        if not current_user:
+            return Response(
+                {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        user_ids = request.data.get("user_ids", [])
+        if not isinstance(user_ids, list) or not all(
+            isinstance(user_id, str) for user_id in user_ids
+        ):
+            return Response(
+                {"error": "user_ids must be a list of strings"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user_ids = user_ids[:1000]
+        visible_ids = set(
+            get_message_users(current_user)
+            .filter(id__in=user_ids)
+            .values_list("id", flat=True)
+        )
+        return Response(
+            {
+                "online": get_online_user_ids(
+                    [user_id for user_id in user_ids if user_id in visible_ids]
+                )
+            },
+            status=status.HTTP_200_OK,
+        )
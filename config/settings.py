@@ -14,6 +14,7 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
@@ -48,12 +49,17 @@ CORS_ALLOW_METHODS = [
     "OPTIONS",
 ]
 
+# Conditional GETs on report detail (ETag / If-None-Match)
+CORS_ALLOW_HEADERS = (*default_headers, "if-none-match")
+CORS_EXPOSE_HEADERS = ["ETag"]
+
 # Session Configuration
 SESSION_COOKIE_AGE = 600  # 10 minutes
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SECURE = True
 SESSION_COOKIE_SAMESITE = 'None'
-SESSION_SAVE_EVERY_REQUEST = True
+# Only the admin uses sessions; API requests never load or save one
+SESSION_SAVE_EVERY_REQUEST = False
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 
 INSTALLED_APPS = [
@@ -84,7 +90,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "app.middleware.analyzetoken.AnalyzeTokenMiddleware",
-    # "app.middleware.rolebaseaccess.RoleBasedAccessMiddleware",
+    "app.middleware.rolebaseaccess.RoleBasedAccessMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -198,7 +204,7 @@ AUTH_USER_MODEL = "app.User"
 # REST Framework Configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "app.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
@@ -225,7 +231,16 @@ TASKS = {
 
 CHANNEL_LAYERS = {
     "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer",
+        "BACKEND": "app.utils.channel_layers.InstrumentedInMemoryChannelLayer",
+        "CONFIG": {
+            # Messages buffered per consumer channel before it counts as slow
+            "capacity": int(os.environ.get("CHANNEL_LAYER_CAPACITY", 100)),
+            "expiry": int(os.environ.get("CHANNEL_LAYER_EXPIRY", 60)),
+            # drop_oldest, coalesce or disconnect
+            "slow_consumer_policy": os.environ.get(
+                "CHANNEL_SLOW_CONSUMER_POLICY", "disconnect"
+            ),
+        },
         # "BACKEND": "channels_redis.core.RedisChannelLayer",
         # "CONFIG": {
         #     "hosts": [(os.environ.get("REDIS_HOST"), os.environ.get("REDIS_PORT"))],
@@ -233,6 +248,64 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Cache Configuration
+# Shared Redis cache when available so invalidation reaches every worker
+if os.environ.get("REDIS_HOST"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": f"redis://{os.environ.get('REDIS_HOST')}:{os.environ.get('REDIS_PORT', 6379)}",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Max missed events replayed on websocket resume before asking for a resync
+WS_RESUME_MAX_EVENTS = int(os.environ.get("WS_RESUME_MAX_EVENTS", 500))
+
+# Presence: seconds without a heartbeat before a user is offline, and how
+# long presence changes are buffered before a snapshot is pushed
+PRESENCE_TTL = int(os.environ.get("PRESENCE_TTL", 60))
+PRESENCE_BATCH_SECONDS = float(os.environ.get("PRESENCE_BATCH_SECONDS", 1))
+
+# Seconds a cached user snapshot (websocket/API principal) stays valid
+USER_SNAPSHOT_TTL = int(os.environ.get("USER_SNAPSHOT_TTL", 60))
+
+# Seconds a login waiting for MFA verification stays valid (signed mfa_token)
+MFA_PENDING_LOGIN_TTL = int(os.environ.get("MFA_PENDING_LOGIN_TTL", 300))
+
+# One-time SMS/email/voice codes: lifetime in the cache and guesses allowed
+MFA_TEMP_CODE_TTL = int(os.environ.get("MFA_TEMP_CODE_TTL", 60))
+MFA_TEMP_CODE_MAX_ATTEMPTS = int(os.environ.get("MFA_TEMP_CODE_MAX_ATTEMPTS", 5))
+
+# Seconds a per-agency report catalog stays cached (writes invalidate it sooner)
+REPORT_CATALOG_TTL = int(os.environ.get("REPORT_CATALOG_TTL", 60 * 60))
+
+# Rows per DELETE statement when reports are deleted in the background
+REPORT_DELETE_CHUNK_SIZE = int(os.environ.get("REPORT_DELETE_CHUNK_SIZE", 1000))
+
+# Days ahead recurring report schedules (and their submissions) are created
+REPORT_SCHEDULE_HORIZON_DAYS = int(os.environ.get("REPORT_SCHEDULE_HORIZON_DAYS", 90))
+
+# Leave the school id list out of access tokens and only send schools_version
+JWT_COMPACT_CLAIMS = os.environ.get("JWT_COMPACT_CLAIMS", "False") == "True"
+
+# Password hashes computed at once per process; logins beyond it get a 429
+PASSWORD_HASH_CONCURRENCY = int(os.environ.get("PASSWORD_HASH_CONCURRENCY", 4))
+
+# Failed login/MFA attempts allowed per account and per IP within the window
+LOGIN_ATTEMPT_WINDOW = int(os.environ.get("LOGIN_ATTEMPT_WINDOW", 900))
+LOGIN_MAX_ATTEMPTS_PER_ACCOUNT = int(os.environ.get("LOGIN_MAX_ATTEMPTS_PER_ACCOUNT", 10))
+LOGIN_MAX_ATTEMPTS_PER_IP = int(os.environ.get("LOGIN_MAX_ATTEMPTS_PER_IP", 100))
+
+# Reverse proxies in front of the app that append to X-Forwarded-For; 0 uses
+# REMOTE_ADDR, since the client controls every entry left of the proxies'
+TRUSTED_PROXY_COUNT = int(os.environ.get("TRUSTED_PROXY_COUNT", 0))
+
 
 # RQ_QUEUES = {
 #     "default": {